@@ -91,6 +91,10 @@ class CentralNervousSystem:
         for plugin in create_builtin_plugins():
             self.plugins.register(plugin)
 
+        # Profile summary cache, invalidated whenever learning writes
+        # could change what the summary reports.
+        self._profile_summary_cache: dict | None = None
+
     async def process_stimulus(
         self,
         stimulus: Stimulus,
@@ -226,6 +230,9 @@ class CentralNervousSystem:
             sentiment={"polarity": 0.0}
         )
 
+        # Execution changed the success rate the summary reports
+        self._profile_summary_cache = None
+
         return result
 
     async def _enrich_context(self, stimulus: Stimulus) -> dict:
@@ -326,6 +333,9 @@ class CentralNervousSystem:
             )
             await self.personality.adapt_from_interaction(self.user_id, interaction)
 
+        # Feedback may have changed preferences, rules or personality
+        self._profile_summary_cache = None
+
     async def _apply_learning(self, updates: list[LearningUpdate]):
         """Apply learning updates to knowledge systems."""
 
@@ -345,6 +355,10 @@ class CentralNervousSystem:
         # Apply to knowledge stores
         await self.knowledge_updater.apply_updates(integrated)
 
+        # Applied updates may have written new memories
+        self.forgetting_prevention.invalidate_index(self.user_id)
+        self._profile_summary_cache = None
+
     async def add_rule(self, condition: str, action: str):
         """Add an explicit rule."""
 
@@ -388,6 +402,9 @@ class CentralNervousSystem:
     async def get_profile_summary(self) -> dict:
         """Get a summary of the user's profile and learned patterns."""
 
+        if self._profile_summary_cache is not None:
+            return self._profile_summary_cache
+
         profile = self.personality.get_profile(self.user_id)
         preferences = self.pref_repo.get_by_user(self.user_id)
         rules = self.rule_repo.get_by_user(self.user_id)
@@ -395,7 +412,7 @@ class CentralNervousSystem:
             self.user_id
         )
 
-        return {
+        summary = {
             "personality": {
                 "warmth": profile.warmth,
                 "formality": profile.formality,
@@ -412,12 +429,18 @@ class CentralNervousSystem:
             "knowledge_protection": protection_status,
             "success_rate": self.executor.get_success_rate(self.user_id)
         }
+        self._profile_summary_cache = summary
+        return summary
 
     async def consolidate_memory(self):
         """Run memory consolidation (like sleep)."""
         await self.memory.consolidate(self.user_id)
         await self.forgetting_prevention.perform_rehearsals(self.user_id)
 
+        # Consolidation merges/deletes memories and rehearsals move the
+        # protection counts the summary reports
+        self._profile_summary_cache = None
+
     async def store_knowledge(
         self,
         content: str,
@@ -437,6 +460,7 @@ class CentralNervousSystem:
             importance=importance,
             context_tags=tags or []
         )
+        self._profile_summary_cache = None
 
     # ========== 10x Enhanced Methods ==========
 
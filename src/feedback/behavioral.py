@@ -10,6 +10,9 @@ from ..models.feedback import FeedbackEvent, InteractionEvent
 from ..models.learning import LearningUpdate, UpdateType, PatternShift
 from ..models.base import Priority
 
+# Immutable affected-memory constant shared across events (see explicit.py).
+_AM_PREF_PROC = ("preference", "procedural")
+
 
 class BehavioralPatternAnalyzer:
     """Analyze behavioral patterns to detect shifts and infer preferences."""
@@ -74,7 +77,7 @@ class BehavioralPatternAnalyzer:
                     "medium_term_count": len(self.medium_term[user_id])
                 }
             },
-            affected_memories=["preference", "procedural"],
+            affected_memories=_AM_PREF_PROC,
             source="behavioral"
         )
 
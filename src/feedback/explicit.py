@@ -8,6 +8,12 @@ from ..models.feedback import FeedbackEvent, FeedbackType, LearningSignal
 from ..models.learning import LearningUpdate, UpdateType
 from ..models.base import Priority
 
+# Shared across handlers: these are logically immutable constants, so each
+# handler reuses one tuple instead of allocating a fresh list per event.
+_AM_PREF = ("preference",)
+_AM_PREF_PROC = ("preference", "procedural")
+_AM_PROC_PREF = ("procedural", "preference")
+
 
 class ExplicitFeedbackProcessor:
     """Process explicit user feedback into learning updates."""
@@ -45,7 +51,7 @@ class ExplicitFeedbackProcessor:
             update_data={
                 "incorrect_action": wrong,
                 "correct_action": correct,
-                "context": event.context.to_dict() if event.context else {},
+                "context": event.context_dict(),
                 "emotional_tone": event.emotional_tone.value,
                 "rule": {
                     "condition": f"When {wrong.lower()} is attempted",
@@ -53,7 +59,7 @@ class ExplicitFeedbackProcessor:
                     "strength": 1.0
                 }
             },
-            affected_memories=["procedural", "preference"],
+            affected_memories=_AM_PROC_PREF,
             source="explicit"
         )
 
@@ -72,9 +78,9 @@ class ExplicitFeedbackProcessor:
                 "behavior": praised_behavior,
                 "reinforcement": "positive",
                 "strength_boost": 0.2,
-                "context": event.context.to_dict() if event.context else {}
+                "context": event.context_dict()
             },
-            affected_memories=["preference"],
+            affected_memories=_AM_PREF,
             source="explicit"
         )
 
@@ -93,9 +99,9 @@ class ExplicitFeedbackProcessor:
                 "behavior": criticized_behavior,
                 "reinforcement": "negative",
                 "strength_reduction": 0.3,
-                "context": event.context.to_dict() if event.context else {}
+                "context": event.context_dict()
             },
-            affected_memories=["preference", "procedural"],
+            affected_memories=_AM_PREF_PROC,
             source="explicit"
         )
 
@@ -115,7 +121,7 @@ class ExplicitFeedbackProcessor:
                 "exceptions": [],
                 "source": "user_explicit"
             },
-            affected_memories=["preference"],
+            affected_memories=_AM_PREF,
             source="explicit"
         )
 
@@ -132,8 +138,8 @@ class ExplicitFeedbackProcessor:
                 "category": event.data.get("category", "general"),
                 "preference": event.data.get("preference", ""),
                 "strength": 0.9,
-                "context": event.context.to_dict() if event.context else {}
+                "context": event.context_dict()
             },
-            affected_memories=["preference"],
+            affected_memories=_AM_PREF,
             source="explicit"
         )
@@ -1,6 +1,7 @@
 """Extract learning signals from implicit user behavior."""
 
 from typing import Optional, List, Dict
+from collections import defaultdict
 from datetime import datetime
 import uuid
 
@@ -8,14 +9,30 @@ from ..models.feedback import FeedbackEvent, FeedbackType, LearningSignal
 from ..models.learning import LearningUpdate, UpdateType
 from ..models.base import Priority
 
+# Immutable affected-memory constants shared across handlers (see explicit.py).
+_AM_PREF = ("preference",)
+_AM_PREF_PROC = ("preference", "procedural")
+
+# Indicator vocabularies for feature extraction, hoisted so the batch ingest
+# path does set membership against frozensets instead of rebuilding list
+# literals and scanning the token list per indicator word.
+_TIME_WORDS = frozenset(["am", "pm", "morning", "afternoon", "evening"])
+_DATE_WORDS = frozenset([
+    "monday", "tuesday", "wednesday", "thursday", "friday",
+    "saturday", "sunday", "today", "tomorrow"
+])
+_FORMAL_INDICATORS = ("please", "kindly", "would", "shall", "regarding", "therefore")
+_CASUAL_INDICATORS = ("hey", "yeah", "gonna", "wanna", "btw", "asap")
+
 
 class ImplicitSignalExtractor:
     """Extract learning signals from implicit user behavior."""
 
     def __init__(self):
-        self.rejection_patterns: Dict[str, List] = {}  # user_id -> patterns
-        self.adoption_rates: Dict[str, Dict] = {}  # user_id -> rates by type
-        self.engagement_history: Dict[str, List] = {}  # user_id -> scores
+        self.rejection_patterns: Dict[str, List] = defaultdict(list)  # user_id -> patterns
+        # user_id -> suggestion_type -> [accepted, total]
+        self.adoption_rates: Dict[str, Dict] = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+        self.engagement_history: Dict[str, List] = defaultdict(list)  # user_id -> scores
 
     async def process(self, event: FeedbackEvent) -> Optional[LearningUpdate]:
         """Process implicit feedback signals."""
@@ -37,13 +54,10 @@ class ImplicitSignalExtractor:
         content = event.data.get("content", "")
 
         # Track rejection pattern
-        if user_id not in self.rejection_patterns:
-            self.rejection_patterns[user_id] = []
-
         pattern = {
             "suggestion_type": suggestion_type,
             "content_features": self._extract_content_features(content),
-            "context": event.context.to_dict() if event.context else {},
+            "context": event.context_dict(),
             "timestamp": datetime.utcnow().isoformat()
         }
         self.rejection_patterns[user_id].append(pattern)
@@ -72,7 +86,7 @@ class ImplicitSignalExtractor:
                 "content_features": pattern["content_features"],
                 "inferred_preference": f"Avoid {suggestion_type} suggestions"
             },
-            affected_memories=["preference"],
+            affected_memories=_AM_PREF,
             source="implicit"
         )
 
@@ -101,7 +115,7 @@ class ImplicitSignalExtractor:
                 "added_aspects": modifications["added"],
                 "modification_pattern": modifications["pattern"]
             },
-            affected_memories=["preference", "procedural"],
+            affected_memories=_AM_PREF_PROC,
             source="implicit"
         )
 
@@ -127,32 +141,34 @@ class ImplicitSignalExtractor:
                 "content_features": self._extract_content_features(content),
                 "inferred_preference": f"Continue {suggestion_type} suggestions"
             },
-            affected_memories=["preference"],
+            affected_memories=_AM_PREF,
             source="implicit"
         )
 
     def _extract_content_features(self, content: str) -> Dict:
-        """Extract features from content for pattern analysis."""
+        """Extract features from content for pattern analysis.
+
+        Tokenizes once and checks indicator vocabularies with set operations
+        so bulk reprocessing of feedback logs stays cheap.
+        """
         words = content.lower().split()
+        word_set = set(words)
 
         return {
             "length": len(content),
             "word_count": len(words),
             "has_numbers": any(c.isdigit() for c in content),
-            "has_time": any(w in words for w in ["am", "pm", "morning", "afternoon", "evening"]),
-            "has_date": any(w in words for w in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday", "today", "tomorrow"]),
+            "has_time": not word_set.isdisjoint(_TIME_WORDS),
+            "has_date": not word_set.isdisjoint(_DATE_WORDS),
             "formality": self._estimate_formality(content),
-            "key_terms": list(set(w for w in words if len(w) > 4))[:10]
+            "key_terms": [w for w in word_set if len(w) > 4][:10]
         }
 
     def _estimate_formality(self, content: str) -> float:
         """Estimate formality level of content (0=casual, 1=formal)."""
-        formal_indicators = ["please", "kindly", "would", "shall", "regarding", "therefore"]
-        casual_indicators = ["hey", "yeah", "gonna", "wanna", "btw", "asap"]
-
         content_lower = content.lower()
-        formal_count = sum(1 for w in formal_indicators if w in content_lower)
-        casual_count = sum(1 for w in casual_indicators if w in content_lower)
+        formal_count = sum(1 for w in _FORMAL_INDICATORS if w in content_lower)
+        casual_count = sum(1 for w in _CASUAL_INDICATORS if w in content_lower)
 
         if formal_count + casual_count == 0:
             return 0.5
@@ -187,29 +203,17 @@ class ImplicitSignalExtractor:
 
     def _update_adoption_rate(self, user_id: str, suggestion_type: str, accepted: bool):
         """Update adoption rate tracking."""
-        if user_id not in self.adoption_rates:
-            self.adoption_rates[user_id] = {}
-
-        if suggestion_type not in self.adoption_rates[user_id]:
-            self.adoption_rates[user_id][suggestion_type] = {
-                "accepted": 0,
-                "total": 0
-            }
-
-        self.adoption_rates[user_id][suggestion_type]["total"] += 1
+        rates = self.adoption_rates[user_id][suggestion_type]
+        rates[1] += 1
         if accepted:
-            self.adoption_rates[user_id][suggestion_type]["accepted"] += 1
+            rates[0] += 1
 
     def get_adoption_rate(self, user_id: str, suggestion_type: str) -> float:
         """Get adoption rate for a suggestion type."""
-        if user_id not in self.adoption_rates:
+        # Plain lookups so reads never materialize defaultdict entries.
+        by_type = self.adoption_rates.get(user_id)
+        rates = by_type.get(suggestion_type) if by_type else None
+        if not rates or rates[1] == 0:
             return 0.5  # Default
 
-        if suggestion_type not in self.adoption_rates[user_id]:
-            return 0.5
-
-        rates = self.adoption_rates[user_id][suggestion_type]
-        if rates["total"] == 0:
-            return 0.5
-
-        return rates["accepted"] / rates["total"]
+        return rates[0] / rates[1]
@@ -2,6 +2,7 @@
 
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
+import heapq
 import uuid
 
 
@@ -143,9 +144,12 @@ class GoalTracker:
         if goal.progress >= 1.0:
             goal.status = "completed"
 
-        # Record check-in
+        # Record check-in. The parsed datetime is kept alongside the ISO
+        # string so readers like get_stalled_goals skip the re-parse.
+        now = datetime.utcnow()
         goal.check_ins.append({
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now.isoformat(),
+            "_ts": now,
             "progress": goal.progress,
             "note": f"Updated to {goal.progress:.0%}"
         })
@@ -210,7 +214,9 @@ class GoalTracker:
 
             # Check last check-in
             if goal.check_ins:
-                last_checkin = datetime.fromisoformat(goal.check_ins[-1]["timestamp"])
+                last = goal.check_ins[-1]
+                # Older check-ins may predate the cached datetime.
+                last_checkin = last.get("_ts") or datetime.fromisoformat(last["timestamp"])
                 if last_checkin < cutoff:
                     stalled.append(goal)
             elif goal.created_at < cutoff:
@@ -248,9 +254,8 @@ class GoalTracker:
                     "priority": goal.priority
                 })
 
-        # Sort by priority
-        suggestions.sort(key=lambda x: x["priority"], reverse=True)
-        return suggestions[:5]
+        # Top 5 by priority; nlargest is O(N log k) instead of a full sort
+        return heapq.nlargest(5, suggestions, key=lambda x: x["priority"])
 
     def check_in(self, user_id: str, goal_id: str, note: str):
         """Record a check-in for a goal."""
@@ -258,8 +263,10 @@ class GoalTracker:
             return
 
         goal = self.goals[user_id][goal_id]
+        now = datetime.utcnow()
         goal.check_ins.append({
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now.isoformat(),
+            "_ts": now,
             "progress": goal.progress,
             "note": note
         })
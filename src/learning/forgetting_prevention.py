@@ -1,12 +1,26 @@
 """Prevent catastrophic forgetting of important knowledge."""
 
 from typing import List, Dict
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
 import uuid
 
+import numpy as np
+
 from ..models.learning import LearningUpdate, KnowledgeProtection
 from ..models.memory import MemoryEntry
-from ..storage.repositories import MemoryRepository
+from ..storage.repositories import MemoryRepository, RehearsalRepository
+
+# Spaced-repetition intervals in days, indexed by rehearsal count and
+# capped at 30; avoids re-deriving 2**n (a bignum for large n) per item.
+_INTERVALS = tuple(min(30, 1 << i) for i in range(64))
+
+# Terms too common to signal real overlap with existing knowledge.
+_STOPWORDS = frozenset([
+    "the", "and", "for", "are", "was", "with", "that", "this", "from",
+    "not", "but", "has", "have", "had", "you", "your", "its", "when",
+    "all", "any", "can", "will", "would", "should", "than", "then"
+])
 
 
 class ForgettingPreventionSystem:
@@ -15,7 +29,21 @@ class ForgettingPreventionSystem:
     def __init__(self, memory_repo: MemoryRepository):
         self.memory_repo = memory_repo
         self.protected_knowledge: Dict[str, KnowledgeProtection] = {}
-        self.rehearsal_schedule: List[Dict] = []
+        # Protections bucketed by user so status queries never have to
+        # resolve each memory's owner through the repository.
+        self._protected_by_user: Dict[str, Dict[str, KnowledgeProtection]] = defaultdict(dict)
+        # The rehearsal schedule lives in its own indexed table so due
+        # lookups are a single query and the schedule survives restarts.
+        self.rehearsal_repo = RehearsalRepository(memory_repo.db)
+        # memory_id -> (content, frozenset of terms); tokenizing every memory
+        # on every overlap check dominates the affected-knowledge scan.
+        self._term_cache: Dict[str, tuple] = {}
+        # Per-user inverted index over memory terms so affected-knowledge
+        # lookup only touches the posting lists for the new terms instead
+        # of scanning every memory. Rebuilt lazily after invalidate_index.
+        self._postings: Dict[str, Dict[str, set]] = {}
+        self._indexed_memories: Dict[str, Dict[str, MemoryEntry]] = {}
+        self._memory_term_count: Dict[str, Dict[str, int]] = {}
 
     async def protect_before_update(
         self,
@@ -56,51 +84,97 @@ class ForgettingPreventionSystem:
     ) -> List[MemoryEntry]:
         """Find existing knowledge that might be affected by new knowledge."""
 
-        affected = []
+        # Extract key terms from new knowledge, dropping stopwords and
+        # very short tokens that would match almost everything.
+        new_content = str(new_knowledge.update_data)
+        new_terms = {
+            t for t in new_content.lower().split()
+            if len(t) > 2 and t not in _STOPWORDS
+        }
 
-        # Get existing memories
-        memories = self.memory_repo.get_by_user(user_id, limit=1000)
+        # Trivial updates (acknowledgements, one-word feedback) can't
+        # meaningfully overlap stored knowledge; skip the lookup.
+        if len(new_terms) < 2:
+            return []
 
-        # Extract key terms from new knowledge
-        new_content = str(new_knowledge.update_data)
-        new_terms = set(new_content.lower().split())
+        self._ensure_index(user_id)
+
+        # Union the posting lists for the new terms; only memories sharing
+        # at least one term are candidates, so the full per-memory scan
+        # is gone.
+        postings = self._postings[user_id]
+        overlap_counts: Counter = Counter()
+        for term in new_terms:
+            ids = postings.get(term)
+            if ids:
+                overlap_counts.update(ids)
 
-        for memory in memories:
-            # Check for overlap
-            memory_terms = set(memory.content.lower().split())
-            overlap = new_terms & memory_terms
+        indexed = self._indexed_memories[user_id]
+        term_counts = self._memory_term_count[user_id]
 
+        affected = []
+        for memory_id, overlap in overlap_counts.items():
             # If significant overlap, might be affected
-            if len(overlap) > 3 or (len(overlap) > 0 and len(overlap) / len(memory_terms) > 0.3):
-                affected.append(memory)
+            if overlap > 3 or overlap / term_counts[memory_id] > 0.3:
+                affected.append(indexed[memory_id])
 
         return affected
 
-    def _calculate_importance(self, memories: List[MemoryEntry]) -> Dict[str, float]:
-        """Calculate importance scores for memories."""
+    def _ensure_index(self, user_id: str):
+        """Build the inverted term index for a user if not already built."""
+
+        if user_id in self._postings:
+            return
 
-        scores = {}
+        postings: Dict[str, set] = {}
+        indexed: Dict[str, MemoryEntry] = {}
+        term_counts: Dict[str, int] = {}
 
-        for memory in memories:
-            # Base importance
-            score = memory.importance
+        cache = self._term_cache
+        for memory in self.memory_repo.get_by_user(user_id, limit=1000):
+            cached = cache.get(memory.id)
+            if cached is None or cached[0] != memory.content:
+                cached = (memory.content, frozenset(memory.content.lower().split()))
+                cache[memory.id] = cached
+            terms = cached[1]
 
-            # Boost for access frequency
-            if memory.access_count > 10:
-                score = min(1.0, score + 0.1)
-            elif memory.access_count > 5:
-                score = min(1.0, score + 0.05)
+            indexed[memory.id] = memory
+            term_counts[memory.id] = len(terms)
+            for term in terms:
+                postings.setdefault(term, set()).add(memory.id)
 
-            # Boost for recency
-            days_old = (datetime.utcnow() - memory.last_accessed).days
-            if days_old < 7:
-                score = min(1.0, score + 0.1)
-            elif days_old < 30:
-                score = min(1.0, score + 0.05)
+        self._postings[user_id] = postings
+        self._indexed_memories[user_id] = indexed
+        self._memory_term_count[user_id] = term_counts
 
-            scores[memory.id] = score
+    def invalidate_index(self, user_id: str):
+        """Drop the cached term index after the user's memories change."""
 
-        return scores
+        self._postings.pop(user_id, None)
+        self._indexed_memories.pop(user_id, None)
+        self._memory_term_count.pop(user_id, None)
+
+    def _calculate_importance(self, memories: List[MemoryEntry]) -> Dict[str, float]:
+        """Calculate importance scores for memories."""
+
+        if not memories:
+            return {}
+
+        # Vectorized over all memories: base importance plus access-count
+        # and recency boosts, clipped to [0, 1].
+        n = len(memories)
+        now = datetime.utcnow()
+        scores = np.fromiter((m.importance for m in memories), dtype=np.float64, count=n)
+        access = np.fromiter((m.access_count for m in memories), dtype=np.int64, count=n)
+        days_old = np.fromiter(
+            ((now - m.last_accessed).days for m in memories), dtype=np.int64, count=n
+        )
+
+        scores += np.where(access > 10, 0.1, np.where(access > 5, 0.05, 0.0))
+        scores += np.where(days_old < 7, 0.1, np.where(days_old < 30, 0.05, 0.0))
+        np.clip(scores, 0.0, 1.0, out=scores)
+
+        return {m.id: float(s) for m, s in zip(memories, scores)}
 
     async def _protect_memory(self, memory: MemoryEntry, importance: float):
         """Add memory to protection list."""
@@ -112,6 +186,7 @@ class ForgettingPreventionSystem:
         )
 
         self.protected_knowledge[memory.id] = protection
+        self._protected_by_user[memory.user_id][memory.id] = protection
 
         # Schedule rehearsal
         await self._schedule_rehearsal(memory, importance)
@@ -127,12 +202,8 @@ class ForgettingPreventionSystem:
         else:
             interval_days = 7
 
-        self.rehearsal_schedule.append({
-            "memory_id": memory.id,
-            "user_id": memory.user_id,
-            "next_rehearsal": datetime.utcnow() + timedelta(days=interval_days),
-            "importance": importance
-        })
+        next_rehearsal = datetime.utcnow() + timedelta(days=interval_days)
+        self.rehearsal_repo.schedule(memory.id, memory.user_id, next_rehearsal, importance)
 
     def _calculate_adaptive_rate(self, max_importance: float) -> float:
         """Calculate learning rate based on affected knowledge importance."""
@@ -155,46 +226,51 @@ class ForgettingPreventionSystem:
         """Perform scheduled rehearsals for a user."""
 
         now = datetime.utcnow()
-        to_rehearse = []
 
-        for item in self.rehearsal_schedule:
-            if item["user_id"] == user_id and item["next_rehearsal"] <= now:
-                to_rehearse.append(item)
+        # The (user_id, next_rehearsal) index resolves due items directly.
+        due = self.rehearsal_repo.get_due(user_id, now)
 
-        for item in to_rehearse:
-            memory_id = item["memory_id"]
-
-            # Update access to reinforce memory
-            self.memory_repo.update_access(memory_id)
+        # Update access in one batched write to reinforce all due memories,
+        # then handle the bookkeeping without per-item I/O.
+        self.memory_repo.bulk_update_access([memory_id for memory_id, _, _ in due])
 
+        rescheduled = []
+        for memory_id, importance, row_count in due:
             # Update protection record
-            if memory_id in self.protected_knowledge:
-                protection = self.protected_knowledge[memory_id]
-                protection.last_rehearsed = now
-                protection.rehearsal_count += 1
-
-            # Reschedule based on rehearsal count (spaced repetition)
             protection = self.protected_knowledge.get(memory_id)
-            if protection:
-                # Increase interval with each rehearsal
-                interval = min(30, 2 ** protection.rehearsal_count)
-                item["next_rehearsal"] = now + timedelta(days=interval)
+            if protection is None:
+                # After a restart the in-memory protection is gone;
+                # rebuild it from the persisted row so the schedule
+                # survives instead of being dropped.
+                protection = KnowledgeProtection(
+                    knowledge_id=memory_id,
+                    importance=importance,
+                    rehearsal_count=row_count,
+                    protection_level="elevated" if importance > 0.9 else "normal"
+                )
+                self.protected_knowledge[memory_id] = protection
+                self._protected_by_user[user_id][memory_id] = protection
+
+            protection.last_rehearsed = now
+            protection.rehearsal_count += 1
+
+            # Reschedule based on rehearsal count (spaced repetition):
+            # increase interval with each rehearsal
+            interval = _INTERVALS[min(protection.rehearsal_count, 63)]
+            rescheduled.append((
+                memory_id, now + timedelta(days=interval), protection.rehearsal_count
+            ))
+
+        self.rehearsal_repo.bulk_reschedule(rescheduled)
 
     async def get_protection_status(self, user_id: str) -> Dict:
         """Get protection status for a user's knowledge."""
 
-        user_protections = {
-            k: v for k, v in self.protected_knowledge.items()
-            if self._get_memory_user(k) == user_id
-        }
+        user_protections = self._protected_by_user.get(user_id, {})
 
         return {
             "protected_count": len(user_protections),
             "critical_count": sum(1 for p in user_protections.values() if p.protection_level == "critical"),
-            "scheduled_rehearsals": sum(1 for s in self.rehearsal_schedule if s["user_id"] == user_id)
+            "scheduled_rehearsals": self.rehearsal_repo.count_scheduled(user_id)
         }
 
-    def _get_memory_user(self, memory_id: str) -> str:
-        """Get user ID for a memory."""
-        memory = self.memory_repo.get(memory_id)
-        return memory.user_id if memory else ""
@@ -1,7 +1,10 @@
 """Integrate learning updates with conflict resolution."""
 
 from typing import List, Dict, Tuple, Optional
+from collections import defaultdict
 from datetime import datetime
+from itertools import combinations
+import asyncio
 
 from ..models.learning import LearningUpdate, UpdateType
 from ..models.base import Priority
@@ -24,43 +27,83 @@ class LearningIntegrator:
         if not updates:
             return []
 
+        # The whole pipeline is CPU-bound (no awaits inside), so run it
+        # off the event loop to avoid blocking concurrent feedback work.
+        return await asyncio.to_thread(self._integrate_sync, updates)
+
+    def _integrate_sync(self, updates: List[LearningUpdate]) -> List[LearningUpdate]:
+        """Run the conflict/consistency/priority pipeline synchronously."""
+
         # Detect and resolve conflicts
-        resolved = await self._resolve_conflicts(updates)
+        resolved = self._resolve_conflicts(updates)
 
         # Check consistency
-        consistent = await self._check_consistency(resolved)
+        consistent = self._check_consistency(resolved)
 
         # Sort by priority and confidence
-        sorted_updates = self._sort_by_priority(consistent)
+        return self._sort_by_priority(consistent)
 
-        return sorted_updates
-
-    async def _resolve_conflicts(self, updates: List[LearningUpdate]) -> List[LearningUpdate]:
+    def _resolve_conflicts(self, updates: List[LearningUpdate]) -> List[LearningUpdate]:
         """Resolve conflicts between updates."""
 
         conflicts = self._detect_conflicts(updates)
+        if not conflicts:
+            return updates
+
+        # Resolve through an id index and a tombstone set so each
+        # resolution is O(1) instead of rescanning the update list.
+        index = {u.id: u for u in updates}
+        discarded: set = set()
 
         for conflict in conflicts:
             resolution = self._resolve_conflict(conflict)
-            updates = self._apply_resolution(updates, conflict, resolution)
+            self._apply_resolution(index, discarded, resolution)
 
-        return updates
+        return [u for u in updates if u.id not in discarded]
 
     def _detect_conflicts(self, updates: List[LearningUpdate]) -> List[Dict]:
         """Detect conflicts between updates."""
         conflicts = []
 
-        for i, u1 in enumerate(updates):
-            for u2 in updates[i+1:]:
-                conflict_type = self._check_conflict(u1, u2)
-                if conflict_type:
-                    conflicts.append({
-                        "type": conflict_type,
-                        "updates": [u1, u2]
-                    })
+        # Updates can only conflict when they share a user and an affected
+        # memory, so bucket by user and index by affected memory rather
+        # than comparing every pair.
+        by_user = defaultdict(list)
+        for u in updates:
+            by_user[u.user_id].append(u)
+
+        checked = set()
+        for group in by_user.values():
+            mem_index = defaultdict(list)
+            for u in group:
+                for memory in u.affected_memories:
+                    mem_index[memory].append(u)
+
+            for candidates in mem_index.values():
+                for u1, u2 in combinations(candidates, 2):
+                    pair = (u1.id, u2.id)
+                    if pair in checked:
+                        continue
+                    checked.add(pair)
+
+                    conflict_type = self._check_conflict(u1, u2)
+                    if conflict_type:
+                        conflicts.append({
+                            "type": conflict_type,
+                            "updates": [u1, u2]
+                        })
 
         return conflicts
 
+    @staticmethod
+    def _affected_set(update: LearningUpdate) -> frozenset:
+        """Affected memories as a frozenset, computed once per update."""
+        cached = getattr(update, "_affected_set_cache", None)
+        if cached is None:
+            cached = frozenset(update.affected_memories)
+            update._affected_set_cache = cached
+        return cached
+
     def _check_conflict(self, u1: LearningUpdate, u2: LearningUpdate) -> Optional[str]:
         """Check if two updates conflict."""
 
@@ -68,8 +111,7 @@ class LearningIntegrator:
         if u1.user_id != u2.user_id:
             return None
 
-        shared_memories = set(u1.affected_memories) & set(u2.affected_memories)
-        if not shared_memories:
+        if self._affected_set(u1).isdisjoint(self._affected_set(u2)):
             return None
 
         # Check for contradictory updates
@@ -88,13 +130,19 @@ class LearningIntegrator:
 
         return None
 
+    @staticmethod
+    def _context_len(update: LearningUpdate) -> int:
+        """Context size for specificity checks, computed once per update."""
+        cached = getattr(update, "_context_len_cache", None)
+        if cached is None:
+            cached = len(update.update_data.get("context", {}))
+            update._context_len_cache = cached
+        return cached
+
     def _is_more_specific(self, u1: LearningUpdate, u2: LearningUpdate) -> bool:
         """Check if u1 is more specific than u2."""
         # Compare based on context depth
-        ctx1 = u1.update_data.get("context", {})
-        ctx2 = u2.update_data.get("context", {})
-
-        return len(ctx1) > len(ctx2) * 1.5
+        return self._context_len(u1) > self._context_len(u2) * 1.5
 
     def _resolve_conflict(self, conflict: Dict) -> Dict:
         """Resolve a conflict between updates."""
@@ -148,47 +196,36 @@ class LearningIntegrator:
 
     def _apply_resolution(
         self,
-        updates: List[LearningUpdate],
-        conflict: Dict,
+        index: Dict[str, LearningUpdate],
+        discarded: set,
         resolution: Dict
-    ) -> List[LearningUpdate]:
-        """Apply conflict resolution to updates."""
+    ):
+        """Apply conflict resolution through the update index."""
 
         action = resolution.get("action", "keep_both")
 
         if action == "discard_loser":
-            loser = resolution["loser"]
-            updates = [u for u in updates if u.id != loser.id]
+            discarded.add(resolution["loser"].id)
 
         elif action == "reduce_loser_confidence":
-            loser = resolution["loser"]
-            for u in updates:
-                if u.id == loser.id:
-                    u.confidence *= 0.5
+            index[resolution["loser"].id].confidence *= 0.5
 
         elif action == "merge_with_recency_weight":
             # Keep both but adjust confidence
-            loser = resolution["loser"]
-            for u in updates:
-                if u.id == loser.id:
-                    u.confidence *= 0.7
+            index[resolution["loser"].id].confidence *= 0.7
 
         elif action == "add_exception_to_general":
             # Mark the general rule as having an exception
-            loser = resolution["loser"]
+            loser = index[resolution["loser"].id]
             winner = resolution["winner"]
-            for u in updates:
-                if u.id == loser.id:
-                    if "exceptions" not in u.update_data:
-                        u.update_data["exceptions"] = []
-                    u.update_data["exceptions"].append({
-                        "context": winner.update_data.get("context", {}),
-                        "override_id": winner.id
-                    })
-
-        return updates
-
-    async def _check_consistency(self, updates: List[LearningUpdate]) -> List[LearningUpdate]:
+            if "exceptions" not in loser.update_data:
+                loser.update_data["exceptions"] = []
+            loser.update_data["exceptions"].append({
+                "context": winner.update_data.get("context", {}),
+                "override_id": winner.id
+            })
+
+    def _check_consistency(self, updates: List[LearningUpdate]) -> List[LearningUpdate]:
         """Check updates for internal consistency."""
 
         consistent = []
@@ -208,14 +245,17 @@ class LearningIntegrator:
     def _sort_by_priority(self, updates: List[LearningUpdate]) -> List[LearningUpdate]:
         """Sort updates by priority and confidence."""
 
-        def sort_key(u: LearningUpdate) -> Tuple:
-            return (
-                self.priority_order.get(u.priority, 0),
-                u.confidence,
-                u.created_at.timestamp()
-            )
-
-        return sorted(updates, key=sort_key, reverse=True)
+        # Counting sort over the four priority levels, then an ordinary
+        # sort within each bucket for the confidence/recency tie-break.
+        buckets: List[List[LearningUpdate]] = [[] for _ in range(5)]
+        for u in updates:
+            buckets[self.priority_order.get(u.priority, 0)].append(u)
+
+        result = []
+        for bucket in reversed(buckets):
+            bucket.sort(key=lambda u: (u.confidence, u.created_at.timestamp()), reverse=True)
+            result.extend(bucket)
+        return result
 
 
 # Helper for type hints
@@ -2,6 +2,9 @@
 
 from typing import List
 from datetime import datetime
+from functools import lru_cache
+import asyncio
+import logging
 import uuid
 
 from ..models.learning import LearningUpdate, UpdateType
@@ -9,6 +12,14 @@ from ..models.memory import MemoryEntry, PreferenceNode, Rule
 from ..models.base import Priority, MemoryType
 from ..storage.repositories import MemoryRepository, PreferenceRepository, RuleRepository
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def _tokenize(text: str) -> frozenset:
+    """Lowercased token set for a text, cached across similarity calls."""
+    return frozenset(text.lower().split())
+
 
 class KnowledgeUpdater:
     """Apply learning updates to persistent knowledge stores."""
@@ -28,40 +39,63 @@ class KnowledgeUpdater:
 
         applied = []
 
-        # Sort by priority
+        # Bucket by priority (counting sort): only four priorities exist,
+        # so a comparison sort is unnecessary.
         priority_order = {
             Priority.CRITICAL: 0,
             Priority.HIGH: 1,
             Priority.MEDIUM: 2,
             Priority.LOW: 3
         }
-        updates.sort(key=lambda u: priority_order.get(u.priority, 4))
-
+        buckets = [[], [], [], [], []]  # last bucket catches unknown priorities
         for update in updates:
-            try:
-                await self._apply_single_update(update)
-                applied.append(update.id)
-            except Exception as e:
-                # Log error but continue with other updates
-                print(f"Error applying update {update.id}: {e}")
+            buckets[priority_order.get(update.priority, 4)].append(update)
+        updates[:] = [u for bucket in buckets for u in bucket]
+
+        # Appliers are independent and DB-bound, so run each priority
+        # bucket concurrently (bounded) while keeping higher-priority
+        # buckets strictly before lower ones.
+        semaphore = asyncio.Semaphore(16)
+
+        # One timestamp per batch; every constructed model reuses it
+        # instead of calling utcnow() per default field.
+        now = datetime.utcnow()
+
+        async def _run(update: LearningUpdate) -> str | None:
+            async with semaphore:
+                try:
+                    await self._apply_single_update(update, now)
+                    return update.id
+                except Exception:
+                    # Log error but continue with other updates
+                    logger.exception("Error applying update %s", update.id)
+                    return None
+
+        for bucket in buckets:
+            if bucket:
+                results = await asyncio.gather(*(_run(u) for u in bucket))
+                applied.extend(update_id for update_id in results if update_id)
 
         return applied
 
-    async def _apply_single_update(self, update: LearningUpdate):
+    async def _apply_single_update(self, update: LearningUpdate, now: datetime | None = None):
         """Apply a single learning update."""
 
+        if now is None:
+            now = datetime.utcnow()
+
         if update.type == UpdateType.BEHAVIOR_CORRECTION:
-            await self._apply_behavior_correction(update)
+            await self._apply_behavior_correction(update, now)
         elif update.type == UpdateType.PREFERENCE_REFINEMENT:
-            await self._apply_preference_refinement(update)
+            await self._apply_preference_refinement(update, now)
         elif update.type == UpdateType.EXPLICIT_RULE:
-            await self._apply_explicit_rule(update)
+            await self._apply_explicit_rule(update, now)
         elif update.type == UpdateType.BEHAVIORAL_PATTERN:
-            await self._apply_behavioral_pattern(update)
+            await self._apply_behavioral_pattern(update, now)
         elif update.type == UpdateType.KNOWLEDGE_UPDATE:
-            await self._apply_knowledge_update(update)
+            await self._apply_knowledge_update(update, now)
 
-    async def _apply_behavior_correction(self, update: LearningUpdate):
+    async def _apply_behavior_correction(self, update: LearningUpdate, now: datetime):
         """Apply a behavior correction."""
 
         data = update.update_data
@@ -78,7 +112,10 @@ class KnowledgeUpdater:
             metadata={
                 "update_id": update.id,
                 "context": data.get("context", {})
-            }
+            },
+            created_at=now,
+            updated_at=now,
+            last_accessed=now
         )
         self.memory_repo.save(memory)
 
@@ -91,11 +128,12 @@ class KnowledgeUpdater:
                 condition=rule_data.get("condition", ""),
                 action=rule_data.get("action", ""),
                 strength=rule_data.get("strength", 1.0),
-                source="learned_correction"
+                source="learned_correction",
+                created_at=now
             )
             self.rule_repo.save(rule)
 
-    async def _apply_preference_refinement(self, update: LearningUpdate):
+    async def _apply_preference_refinement(self, update: LearningUpdate, now: datetime):
         """Apply a preference refinement."""
 
         data = update.update_data
@@ -108,10 +146,12 @@ class KnowledgeUpdater:
             prefs = self.pref_repo.get_by_user(user_id, category)
 
             behavior = data.get("behavior", "")
+            strength_updates = []
             for pref in prefs:
                 if self._text_similarity(pref.preference, behavior) > 0.5:
                     new_strength = min(1.0, pref.strength + data.get("strength_boost", 0.1))
-                    self.pref_repo.update_strength(pref.id, new_strength)
+                    strength_updates.append((pref.id, new_strength))
+            self.pref_repo.bulk_update_strength(strength_updates)
 
         elif data.get("reinforcement") == "negative":
             # Weaken preferences
@@ -119,10 +159,12 @@ class KnowledgeUpdater:
             prefs = self.pref_repo.get_by_user(user_id, category)
 
             behavior = data.get("behavior", "")
+            strength_updates = []
             for pref in prefs:
                 if self._text_similarity(pref.preference, behavior) > 0.5:
                     new_strength = max(0.0, pref.strength - data.get("strength_reduction", 0.2))
-                    self.pref_repo.update_strength(pref.id, new_strength)
+                    strength_updates.append((pref.id, new_strength))
+            self.pref_repo.bulk_update_strength(strength_updates)
 
         else:
             # Create new preference
@@ -133,11 +175,13 @@ class KnowledgeUpdater:
                 preference=data.get("preference", data.get("inferred_preference", "")),
                 strength=data.get("strength", update.confidence),
                 confidence=update.confidence,
-                source=update.source
+                source=update.source,
+                created_at=now,
+                updated_at=now
             )
             self.pref_repo.save(pref)
 
-    async def _apply_explicit_rule(self, update: LearningUpdate):
+    async def _apply_explicit_rule(self, update: LearningUpdate, now: datetime):
         """Apply an explicit rule definition."""
 
         data = update.update_data
@@ -150,7 +194,8 @@ class KnowledgeUpdater:
             action=data.get("action", ""),
             strength=data.get("strength", 1.0),
             exceptions=data.get("exceptions", []),
-            source="user_explicit"
+            source="user_explicit",
+            created_at=now
         )
         self.rule_repo.save(rule)
 
@@ -162,43 +207,54 @@ class KnowledgeUpdater:
             preference=f"{data.get('condition', '')} -> {data.get('action', '')}",
             strength=1.0,
             confidence=0.99,
-            source="explicit"
+            source="explicit",
+            created_at=now,
+            updated_at=now
         )
         self.pref_repo.save(pref)
 
-    async def _apply_behavioral_pattern(self, update: LearningUpdate):
+    async def _apply_behavioral_pattern(self, update: LearningUpdate, now: datetime):
         """Apply behavioral pattern learnings."""
 
         data = update.update_data
         user_id = update.user_id
 
-        # Store pattern shifts as memories
-        for shift in data.get("pattern_shifts", []):
-            memory = MemoryEntry(
+        # Store pattern shifts as memories, written in one batch
+        memories = [
+            MemoryEntry(
                 id=str(uuid.uuid4()),
                 user_id=user_id,
                 memory_type=MemoryType.SEMANTIC,
                 content=f"Pattern shift: {shift.get('pattern_type', '')} changed from {shift.get('old_pattern', {})} to {shift.get('new_pattern', {})}",
                 importance=shift.get("confidence", 0.5),
                 context_tags=["pattern", "behavioral"],
-                metadata=shift
+                metadata=shift,
+                created_at=now,
+                updated_at=now,
+                last_accessed=now
             )
-            self.memory_repo.save(memory)
+            for shift in data.get("pattern_shifts", [])
+        ]
+        self.memory_repo.bulk_save(memories)
 
-        # Store inferred preferences
-        for pref_data in data.get("inferred_preferences", []):
-            pref = PreferenceNode(
+        # Store inferred preferences, also batched
+        prefs = [
+            PreferenceNode(
                 id=str(uuid.uuid4()),
                 user_id=user_id,
                 category=pref_data.get("category", "behavioral"),
                 preference=pref_data.get("preference", ""),
                 strength=pref_data.get("confidence", 0.5),
                 confidence=pref_data.get("confidence", 0.5),
-                source="inferred"
+                source="inferred",
+                created_at=now,
+                updated_at=now
             )
-            self.pref_repo.save(pref)
+            for pref_data in data.get("inferred_preferences", [])
+        ]
+        self.pref_repo.bulk_save(prefs)
 
-    async def _apply_knowledge_update(self, update: LearningUpdate):
+    async def _apply_knowledge_update(self, update: LearningUpdate, now: datetime):
         """Apply general knowledge update."""
 
         data = update.update_data
@@ -211,19 +267,23 @@ class KnowledgeUpdater:
             content=data.get("content", ""),
             importance=update.confidence,
             context_tags=data.get("tags", []),
-            metadata=data.get("metadata", {})
+            metadata=data.get("metadata", {}),
+            created_at=now,
+            updated_at=now,
+            last_accessed=now
         )
         self.memory_repo.save(memory)
 
     def _text_similarity(self, text1: str, text2: str) -> float:
         """Simple text similarity based on word overlap."""
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
+        words1 = _tokenize(text1)
+        words2 = _tokenize(text2)
 
         if not words1 or not words2:
             return 0.0
 
+        # Union size derived arithmetically; no union set is built.
         overlap = len(words1 & words2)
-        total = len(words1 | words2)
+        total = len(words1) + len(words2) - overlap
 
         return overlap / total if total > 0 else 0.0
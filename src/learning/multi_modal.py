@@ -29,14 +29,17 @@ class MultiModalLearner:
 
         updates = []
 
-        # Process through explicit processor
-        explicit_update = await self.explicit_processor.process(event)
+        # The explicit and implicit processors are independent, so run
+        # them concurrently instead of serializing their latency.
+        explicit_update, implicit_update = await asyncio.gather(
+            self.explicit_processor.process(event),
+            self.implicit_extractor.process(event)
+        )
+
         if explicit_update:
             explicit_update.update_data["learning_rate"] = self.learning_rates["immediate"]
             updates.append(explicit_update)
 
-        # Process through implicit extractor
-        implicit_update = await self.implicit_extractor.process(event)
         if implicit_update:
             implicit_update.update_data["learning_rate"] = self.learning_rates["short_term"]
             updates.append(implicit_update)
@@ -61,14 +64,16 @@ class MultiModalLearner:
 
         all_updates = []
 
-        # Process feedback events
-        for event in feedback_events:
-            updates = await self.process_feedback(event)
+        # Fan out all events concurrently; each task is independent.
+        feedback_results, interaction_results = await asyncio.gather(
+            asyncio.gather(*(self.process_feedback(e) for e in feedback_events)),
+            asyncio.gather(*(self.process_interaction(e) for e in interaction_events))
+        )
+
+        for updates in feedback_results:
             all_updates.extend(updates)
 
-        # Process interaction events
-        for event in interaction_events:
-            update = await self.process_interaction(event)
+        for update in interaction_results:
             if update:
                 all_updates.append(update)
 
@@ -8,6 +8,7 @@ A fully functional personalized AI agent that learns and adapts to users.
 import asyncio
 import argparse
 import json
+import re
 from datetime import datetime
 
 from .core.central_system import CentralNervousSystem
@@ -15,6 +16,22 @@ from .models.base import Context, Stimulus, ActionType
 from .models.action import ActionPlan
 from .models.feedback import FeedbackType, EmotionalTone
 
+# Prefer orjson's C serializer for result display when available; fall
+# back to the stdlib with identical output options.
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, indent=2, default=str)
+
+# Precompiled intent keyword patterns; checked in priority order with one
+# C-level scan each instead of per-keyword Python substring loops.
+_SCHEDULING_RE = re.compile(r"schedule|meeting|calendar")
+_REMINDER_RE = re.compile(r"remind|remember|note")
+
 
 class AgentCLI:
     """Command-line interface for the adaptive agent."""
@@ -45,7 +62,9 @@ class AgentCLI:
 
         while True:
             try:
-                user_input = input(f"[{self.user_id}] > ").strip()
+                # input() runs in a worker thread so the event loop stays
+                # free for background work while waiting on the user.
+                user_input = (await asyncio.to_thread(input, f"[{self.user_id}] > ")).strip()
 
                 if not user_input:
                     continue
@@ -109,11 +128,12 @@ class AgentCLI:
         """Handle a regular message as a stimulus."""
 
         # Detect message type
+        lowered = message.lower()
         if "?" in message:
             stimulus_type = "question"
-        elif any(word in message.lower() for word in ["schedule", "meeting", "calendar"]):
+        elif _SCHEDULING_RE.search(lowered):
             stimulus_type = "scheduling"
-        elif any(word in message.lower() for word in ["remind", "remember", "note"]):
+        elif _REMINDER_RE.search(lowered):
             stimulus_type = "reminder"
         else:
             stimulus_type = "general"
@@ -140,7 +160,7 @@ class AgentCLI:
             print(f"Action completed: {result.success}")
 
         if result.result_data:
-            print(f"\nDetails: {json.dumps(result.result_data, indent=2, default=str)}")
+            print(f"\nDetails: {_dumps(result.result_data)}")
         print("-"*40 + "\n")
 
     def _show_help(self):
@@ -263,8 +283,8 @@ class AgentCLI:
     async def _add_rule_interactive(self):
         """Add a new rule interactively."""
         print("\n--- Add New Rule ---")
-        condition = input("  Condition (when should this apply?): ").strip()
-        action = input("  Action (what should be done?): ").strip()
+        condition = (await asyncio.to_thread(input, "  Condition (when should this apply?): ")).strip()
+        action = (await asyncio.to_thread(input, "  Action (what should be done?): ")).strip()
 
         if condition and action:
             await self.agent.add_rule(condition, action)
@@ -275,9 +295,9 @@ class AgentCLI:
     async def _add_preference_interactive(self):
         """Add a new preference interactively."""
         print("\n--- Add New Preference ---")
-        category = input("  Category (e.g., communication, scheduling): ").strip()
-        preference = input("  Preference description: ").strip()
-        strength_str = input("  Strength (0.0-1.0, default 0.8): ").strip()
+        category = (await asyncio.to_thread(input, "  Category (e.g., communication, scheduling): ")).strip()
+        preference = (await asyncio.to_thread(input, "  Preference description: ")).strip()
+        strength_str = (await asyncio.to_thread(input, "  Strength (0.0-1.0, default 0.8): ")).strip()
 
         try:
             strength = float(strength_str) if strength_str else 0.8
@@ -293,9 +313,9 @@ class AgentCLI:
     async def _correct_behavior_interactive(self):
         """Correct a behavior interactively."""
         print("\n--- Correct Behavior ---")
-        wrong = input("  What was wrong: ").strip()
-        correct = input("  What should have happened: ").strip()
-        tone_str = input("  Your tone (neutral/frustrated/pleased): ").strip().lower()
+        wrong = (await asyncio.to_thread(input, "  What was wrong: ")).strip()
+        correct = (await asyncio.to_thread(input, "  What should have happened: ")).strip()
+        tone_str = (await asyncio.to_thread(input, "  Your tone (neutral/frustrated/pleased): ")).strip().lower()
 
         tone_map = {
             "frustrated": EmotionalTone.FRUSTRATED,
@@ -313,9 +333,9 @@ class AgentCLI:
     async def _store_knowledge_interactive(self):
         """Store knowledge interactively."""
         print("\n--- Store Knowledge ---")
-        content = input("  Content to store: ").strip()
-        mem_type = input("  Type (episodic/semantic/procedural): ").strip().lower()
-        importance_str = input("  Importance (0.0-1.0, default 0.5): ").strip()
+        content = (await asyncio.to_thread(input, "  Content to store: ")).strip()
+        mem_type = (await asyncio.to_thread(input, "  Type (episodic/semantic/procedural): ")).strip().lower()
+        importance_str = (await asyncio.to_thread(input, "  Importance (0.0-1.0, default 0.5): ")).strip()
 
         if mem_type not in ["episodic", "semantic", "procedural"]:
             mem_type = "semantic"
@@ -325,7 +345,7 @@ class AgentCLI:
         except ValueError:
             importance = 0.5
 
-        tags_str = input("  Tags (comma-separated, optional): ").strip()
+        tags_str = (await asyncio.to_thread(input, "  Tags (comma-separated, optional): ")).strip()
         tags = [t.strip() for t in tags_str.split(",")] if tags_str else []
 
         if content:
@@ -337,7 +357,7 @@ class AgentCLI:
     async def _recall_memories(self, query: str):
         """Recall memories matching a query."""
         if not query:
-            query = input("  Search query: ").strip()
+            query = (await asyncio.to_thread(input, "  Search query: ")).strip()
 
         if not query:
             print("  No query provided.\n")
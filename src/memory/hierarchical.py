@@ -1,9 +1,11 @@
 """Hierarchical memory system combining multiple memory types."""
 
 from typing import List, Dict, Optional, Tuple
-from datetime import datetime
+import asyncio
 import uuid
 
+import numpy as np
+
 from ..models.memory import MemoryEntry
 from ..models.base import MemoryType, Context
 from ..storage.repositories import MemoryRepository, PreferenceRepository
@@ -51,7 +53,8 @@ class HierarchicalMemory:
             metadata=metadata or {}
         )
 
-        return self.memory_repo.save(memory)
+        # Offload the blocking write so the event loop stays responsive
+        return await asyncio.to_thread(self.memory_repo.save, memory)
 
     async def retrieve(
         self,
@@ -63,32 +66,31 @@ class HierarchicalMemory:
     ) -> List[Tuple[MemoryEntry, float]]:
         """Retrieve relevant memories across all or specified types."""
 
-        all_results = []
-
         types_to_search = memory_types or [
             MemoryType.EPISODIC,
             MemoryType.SEMANTIC,
             MemoryType.PROCEDURAL
         ]
 
-        for mem_type in types_to_search:
-            results = await self.vector_store.similarity_search(
-                user_id=user_id,
-                query=query,
-                memory_type=mem_type,
-                top_k=top_k,
-                recency_weight=recency_weight
-            )
-            all_results.extend(results)
-
-        # Sort all results by score
-        all_results.sort(key=lambda x: x[1], reverse=True)
+        # One fetch and one scored scan across all requested types,
+        # already ordered by score.
+        all_results = await self.vector_store.similarity_search_multi(
+            user_id=user_id,
+            query=query,
+            memory_types=types_to_search,
+            top_k=top_k,
+            recency_weight=recency_weight
+        )
 
-        # Update access counts for retrieved memories
-        for memory, score in all_results[:top_k]:
-            self.memory_repo.update_access(memory.id)
+        # Update access counts for retrieved memories in one write,
+        # off-loop so retrieval doesn't stall on the fsync
+        top_results = all_results[:top_k]
+        await asyncio.to_thread(
+            self.memory_repo.bulk_update_access,
+            [memory.id for memory, _ in top_results]
+        )
 
-        return all_results[:top_k]
+        return top_results
 
     async def retrieve_relevant_context(
         self,
@@ -99,22 +101,23 @@ class HierarchicalMemory:
     ) -> Dict:
         """Retrieve comprehensive context for a query."""
 
-        # Get relevant memories
-        memories = await self.retrieve(
-            user_id=user_id,
-            query=query,
-            recency_weight=recency_weight
-        )
-
-        # Get relevant preferences
-        preferences = await self.preference_graph.query_relevant_preferences(
-            user_id=user_id,
-            context={
-                "query": query,
-                "time_of_day": context.time_of_day,
-                "day_type": context.day_type,
-                **context.user_state
-            }
+        # Memory retrieval and preference scoring are independent, so
+        # overlap them instead of awaiting one after the other.
+        memories, preferences = await asyncio.gather(
+            self.retrieve(
+                user_id=user_id,
+                query=query,
+                recency_weight=recency_weight
+            ),
+            self.preference_graph.query_relevant_preferences(
+                user_id=user_id,
+                context={
+                    "query": query,
+                    "time_of_day": context.time_of_day,
+                    "day_type": context.day_type,
+                    **context.user_state
+                }
+            )
         )
 
         return {
@@ -135,34 +138,81 @@ class HierarchicalMemory:
         Consolidate memories - merge similar ones, decay old unimportant ones.
         This simulates the brain's memory consolidation during sleep.
         """
-        memories = self.memory_repo.get_by_user(user_id, limit=10000)
+        # Stream the rows in chunks rather than materializing the full
+        # 10k fetch at once; only memories with embeddings are kept.
+        def _load_embedded():
+            loaded = []
+            for chunk in self.memory_repo.iter_by_user(user_id):
+                loaded.extend(m for m in chunk if m.embedding is not None)
+            return loaded
+
+        # Compute all pairwise similarities with one normalized matmul
+        # instead of N^2 Python-level cosine calls. Mixed-vintage
+        # embeddings are expected in a bulk fetch (stored rows can
+        # predate a vocabulary rebuild), so consolidate zero-pads them
+        # into a common-width matrix locally - unlike the strict cosine
+        # kernels, which raise on length mismatch.
+        # float32 is deliberate: it halves bandwidth vs float64 while
+        # staying BLAS-backed. Int8 quantization was considered and not
+        # taken -- NumPy has no int8 GEMM to exploit, and the embedding
+        # BLOBs carry no dtype tag, so requantizing storage would
+        # silently corrupt rows written by older code.
+        embedded = await asyncio.to_thread(_load_embedded)
 
-        # Group similar memories
         groups = []
-        processed = set()
-
-        for i, mem in enumerate(memories):
-            if mem.id in processed:
-                continue
-
-            group = [mem]
-            processed.add(mem.id)
-
-            for j, other in enumerate(memories[i+1:], i+1):
-                if other.id in processed:
-                    continue
-
-                # Check similarity
-                if mem.embedding is not None and other.embedding is not None:
-                    sim = self.vector_store._cosine_similarity(mem.embedding, other.embedding)
-                    if sim > 0.8:  # Very similar
-                        group.append(other)
-                        processed.add(other.id)
-
-            if len(group) > 1:
-                groups.append(group)
-
-        # Merge groups
+        if len(embedded) > 1:
+            dim = max(len(m.embedding) for m in embedded)
+            matrix = np.zeros((len(embedded), dim), dtype=np.float32)
+            for row, memory in enumerate(embedded):
+                matrix[row, :len(memory.embedding)] = memory.embedding
+
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            np.maximum(norms, 1e-9, out=norms)
+            matrix /= norms
+
+            # Extract above-threshold pairs in row blocks so the full
+            # N x N similarity matrix is never materialized (at the 10k
+            # fetch limit that would be ~400MB). Each block is one BLAS
+            # matmul against the full matrix.
+            pair_rows = []
+            block = 1024
+            for start in range(0, len(embedded), block):
+                stop = min(start + block, len(embedded))
+                sim_block = matrix[start:stop] @ matrix.T
+                found = np.argwhere(sim_block > 0.8)
+                found[:, 0] += start
+                # Keep only the upper triangle (i < j)
+                pair_rows.append(found[found[:, 0] < found[:, 1]])
+
+            # Group similar memories with union-find over the above-
+            # threshold pairs: near-linear instead of walking similarity
+            # chains repeatedly, and transitively-similar memories land
+            # in one group.
+            pairs = np.concatenate(pair_rows) if pair_rows else np.empty((0, 2), dtype=int)
+
+            parent = list(range(len(embedded)))
+
+            def find(i: int) -> int:
+                while parent[i] != i:
+                    parent[i] = parent[parent[i]]  # path compression
+                    i = parent[i]
+                return i
+
+            for i, j in pairs:
+                root_i, root_j = find(int(i)), find(int(j))
+                if root_i != root_j:
+                    parent[root_j] = root_i
+
+            by_root: Dict[int, list] = {}
+            for idx, memory in enumerate(embedded):
+                by_root.setdefault(find(idx), []).append(memory)
+
+            groups = [group for group in by_root.values() if len(group) > 1]
+
+        # Merge groups, accumulating the writes so the merged memories
+        # are deleted and the primaries saved in one statement each.
+        to_delete = []
+        primaries = []
         for group in groups:
             # Keep the most important/recent one
             group.sort(key=lambda m: (m.importance, m.access_count), reverse=True)
@@ -171,27 +221,17 @@ class HierarchicalMemory:
             # Boost importance of merged memory
             primary.importance = min(1.0, primary.importance + 0.1 * len(group))
 
-            # Delete others
-            for mem in group[1:]:
-                self.memory_repo.delete(mem.id)
+            to_delete.extend(mem.id for mem in group[1:])
+            primaries.append(primary)
 
-            self.memory_repo.save(primary)
+        await asyncio.to_thread(self.memory_repo.delete_many, to_delete)
+        await asyncio.to_thread(self.memory_repo.bulk_save, primaries)
 
     async def forget(self, user_id: str, decay_threshold: float = 0.1):
         """
         Forget low-importance, rarely accessed memories.
         Simulates natural forgetting.
         """
-        memories = self.memory_repo.get_by_user(user_id, limit=10000)
-
-        now = datetime.utcnow()
-
-        for memory in memories:
-            # Calculate decay based on time and access
-            days_since_access = (now - memory.last_accessed).days
-
-            # Low importance + old + rarely accessed = forget
-            if (memory.importance < decay_threshold and
-                days_since_access > 30 and
-                memory.access_count < 3):
-                self.memory_repo.delete(memory.id)
+        # Low importance + old + rarely accessed = forget. The predicate
+        # runs in SQL so no rows are materialized just to be discarded.
+        await asyncio.to_thread(self.memory_repo.delete_decayed, user_id, decay_threshold)
@@ -4,15 +4,97 @@ from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import uuid
 
+import numpy as np
+
 from ..models.memory import PreferenceNode
 from ..storage.repositories import PreferenceRepository
 
 
+def _pref_tokens(pref: PreferenceNode) -> tuple:
+    """Lowercased preference tokens, computed once per loaded node."""
+    cached = getattr(pref, "_tokens_cache", None)
+    if cached is None:
+        cached = tuple(pref.preference.lower().split())
+        pref._tokens_cache = cached
+    return cached
+
+
+# Words that flag a preference as prohibitive rather than desired.
+_NEGATIONS = ("not", "never", "avoid", "don't", "without")
+
+
+def _pref_is_negative(pref: PreferenceNode) -> bool:
+    """Whether a preference is a negative one, computed once per node."""
+    cached = getattr(pref, "_is_negative_cache", None)
+    if cached is None:
+        lowered = pref.preference.lower()
+        cached = any(neg in lowered for neg in _NEGATIONS)
+        pref._is_negative_cache = cached
+    return cached
+
+
+def _pref_content_tokens(pref: PreferenceNode) -> tuple:
+    """Preference tokens minus negation words, computed once per node."""
+    cached = getattr(pref, "_content_tokens_cache", None)
+    if cached is None:
+        cached = tuple(w for w in _pref_tokens(pref) if w not in _NEGATIONS)
+        pref._content_tokens_cache = cached
+    return cached
+
+
+def _fingerprint(words) -> int:
+    """64-bit bitmask fingerprint of a token collection."""
+    fp = 0
+    for w in words:
+        fp |= 1 << (hash(w) & 63)
+    return fp
+
+
+def _pref_fingerprint(pref: PreferenceNode) -> int:
+    """Token fingerprint for a preference, computed once per loaded node."""
+    cached = getattr(pref, "_fingerprint_cache", None)
+    if cached is None:
+        cached = _fingerprint(_pref_tokens(pref))
+        pref._fingerprint_cache = cached
+    return cached
+
+
+def _pref_category_lower(pref: PreferenceNode) -> str:
+    """Lowercased category, computed once per loaded node."""
+    cached = getattr(pref, "_category_lower_cache", None)
+    if cached is None:
+        cached = pref.category.lower()
+        pref._category_lower_cache = cached
+    return cached
+
+
 class PreferenceGraph:
     """Graph-based preference system for tracking and querying user preferences."""
 
     def __init__(self, pref_repo: PreferenceRepository):
         self.pref_repo = pref_repo
+        # user_id -> (repo version, loaded prefs); avoids re-reading and
+        # re-tokenizing the whole preference list per stimulus.
+        self._prefs_cache: Dict[str, tuple] = {}
+
+    def _get_all_prefs(self, user_id: str) -> Tuple[List[PreferenceNode], np.ndarray]:
+        """Get a user's preferences plus their strength*confidence weights.
+
+        The weights live in a parallel NumPy column so filtering doesn't
+        chase per-object attributes; both are cached until the repository
+        changes.
+        """
+        cached = self._prefs_cache.get(user_id)
+        if cached is not None and cached[0] == self.pref_repo.version:
+            return cached[1], cached[2]
+
+        prefs = self.pref_repo.get_by_user(user_id)
+        weights = np.fromiter(
+            (p.strength * p.confidence for p in prefs),
+            dtype=np.float64, count=len(prefs)
+        )
+        self._prefs_cache[user_id] = (self.pref_repo.version, prefs, weights)
+        return prefs, weights
 
     async def add_preference(
         self,
@@ -60,12 +142,17 @@ class PreferenceGraph:
         """Find a similar existing preference."""
         prefs = self.pref_repo.get_by_user(user_id, category)
 
-        # Simple keyword matching
+        # Simple keyword matching. The fingerprint check is an exact-safe
+        # prefilter: tokens shared by two preferences always share bits,
+        # so a zero intersection means the full set overlap is zero.
         pref_words = set(preference.lower().split())
+        new_fp = _fingerprint(pref_words)
 
         for p in prefs:
-            existing_words = set(p.preference.lower().split())
-            overlap = len(pref_words & existing_words)
+            if not (new_fp & _pref_fingerprint(p)):
+                continue
+
+            overlap = len(pref_words & set(_pref_tokens(p)))
             if overlap >= len(pref_words) * 0.6:  # 60% overlap
                 return p
 
@@ -87,27 +174,33 @@ class PreferenceGraph:
         context: Dict
     ) -> List[PreferenceNode]:
         """Get preferences relevant to a given context."""
-        all_prefs = self.pref_repo.get_by_user(user_id)
+        all_prefs, weights = self._get_all_prefs(user_id)
 
         # Score preferences by relevance to context
         scored_prefs = []
         context_text = " ".join(str(v) for v in context.values()).lower()
 
-        for pref in all_prefs:
+        # Relevance tops out at 0.8 (0.3 category + 0.5 content), so
+        # preferences whose strength*confidence weight can't clear the
+        # score threshold never need string matching; one vectorized
+        # comparison picks the candidates.
+        for idx in np.flatnonzero(weights * 0.8 > 0.1):
+            pref = all_prefs[idx]
+            weight = weights[idx]
+
             relevance = 0.0
 
             # Check category match
-            if pref.category.lower() in context_text:
+            if _pref_category_lower(pref) in context_text:
                 relevance += 0.3
 
             # Check preference content match
-            pref_words = pref.preference.lower().split()
+            pref_words = _pref_tokens(pref)
             matches = sum(1 for w in pref_words if w in context_text)
             if pref_words:
                 relevance += 0.5 * (matches / len(pref_words))
 
-            # Weight by strength and confidence
-            final_score = relevance * pref.strength * pref.confidence
+            final_score = relevance * weight
 
             if final_score > 0.1:
                 scored_prefs.append((pref, final_score))
@@ -118,12 +211,9 @@ class PreferenceGraph:
 
     async def weaken_preference(self, pref_id: str, factor: float = 0.7):
         """Weaken a preference (when contradicted)."""
-        prefs = self.pref_repo.get_by_user("")  # Get all to find by ID
-        for pref in prefs:
-            if pref.id == pref_id:
-                new_strength = pref.strength * factor
-                self.pref_repo.update_strength(pref_id, new_strength)
-                break
+        pref = self.pref_repo.get(pref_id)
+        if pref:
+            self.pref_repo.update_strength(pref_id, pref.strength * factor)
 
     async def add_exception(
         self,
@@ -132,16 +222,14 @@ class PreferenceGraph:
         correct_behavior: str
     ):
         """Add an exception to a preference."""
-        prefs = self.pref_repo.get_by_user("")
-        for pref in prefs:
-            if pref.id == pref_id:
-                pref.exceptions.append({
-                    "context": exception_context,
-                    "correct_behavior": correct_behavior,
-                    "added_at": datetime.utcnow().isoformat()
-                })
-                self.pref_repo.save(pref)
-                break
+        pref = self.pref_repo.get(pref_id)
+        if pref:
+            pref.exceptions.append({
+                "context": exception_context,
+                "correct_behavior": correct_behavior,
+                "added_at": datetime.utcnow().isoformat()
+            })
+            self.pref_repo.save(pref)
 
     async def predict_discomfort(
         self,
@@ -150,28 +238,21 @@ class PreferenceGraph:
     ) -> List[Dict]:
         """Predict if an action might violate user preferences."""
         violations = []
-        prefs = self.pref_repo.get_by_user(user_id)
+        prefs, _ = self._get_all_prefs(user_id)
 
         action_text = " ".join(str(v) for v in proposed_action.values()).lower()
 
         for pref in prefs:
-            # Check for potential violations
-            pref_words = pref.preference.lower().split()
-
-            # Look for negation patterns
-            negations = ['not', 'never', 'avoid', 'don\'t', 'without']
-            is_negative_pref = any(neg in pref.preference.lower() for neg in negations)
-
-            if is_negative_pref:
+            # Negation detection and token stripping are cached per node,
+            # so each prediction only runs the substring checks.
+            if _pref_is_negative(pref):
                 # Check if action contains what should be avoided
-                for word in pref_words:
-                    if word not in negations and word in action_text:
-                        violations.append({
-                            "preference_id": pref.id,
-                            "preference": pref.preference,
-                            "confidence": pref.confidence * pref.strength,
-                            "type": "potential_violation"
-                        })
-                        break
+                if any(word in action_text for word in _pref_content_tokens(pref)):
+                    violations.append({
+                        "preference_id": pref.id,
+                        "preference": pref.preference,
+                        "confidence": pref.confidence * pref.strength,
+                        "type": "potential_violation"
+                    })
 
         return violations
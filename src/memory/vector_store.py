@@ -3,6 +3,7 @@
 import numpy as np
 from typing import List, Tuple, Optional
 from collections import Counter
+from functools import lru_cache
 import re
 import math
 
@@ -10,19 +11,69 @@ from ..models.memory import MemoryEntry
 from ..models.base import MemoryType
 from ..storage.repositories import MemoryRepository
 
+# Optional SIMD-dispatched cosine kernels; the NumPy path below remains
+# the fallback when the package isn't installed.
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+# Stop words, hoisted so the set is built once instead of per call.
+_STOP_WORDS = frozenset({'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
+                         'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
+                         'would', 'could', 'should', 'may', 'might', 'must', 'shall',
+                         'to', 'of', 'in', 'for', 'on', 'with', 'at', 'by', 'from',
+                         'as', 'into', 'through', 'during', 'before', 'after', 'above',
+                         'below', 'between', 'under', 'again', 'further', 'then', 'once',
+                         'and', 'but', 'or', 'nor', 'so', 'yet', 'both', 'either',
+                         'neither', 'not', 'only', 'own', 'same', 'than', 'too', 'very',
+                         'just', 'also', 'now', 'here', 'there', 'when', 'where', 'why',
+                         'how', 'all', 'each', 'every', 'both', 'few', 'more', 'most',
+                         'other', 'some', 'such', 'no', 'not', 'only', 'own', 'same',
+                         'so', 'than', 'too', 'very', 'can', 'will', 'just', 'don',
+                         'should', 'now', 'i', 'me', 'my', 'myself', 'we', 'our', 'ours',
+                         'you', 'your', 'yours', 'he', 'him', 'his', 'she', 'her', 'hers',
+                         'it', 'its', 'they', 'them', 'their', 'theirs', 'what', 'which',
+                         'who', 'whom', 'this', 'that', 'these', 'those', 'am'})
+
+# One pattern that tokenizes, drops stop words (negative lookahead) and
+# enforces the minimum length in a single C-level findall pass.
+_TOKEN_RE = re.compile(
+    r'\b(?!(?:' + '|'.join(sorted(_STOP_WORDS)) + r')\b)[a-z]{3,}\b'
+)
+
+
+@lru_cache(maxsize=10000)
+def _tokenize_cached(text: str) -> tuple:
+    """Tokenize text, cached so repeated contents skip the regex pass."""
+    return tuple(_TOKEN_RE.findall(text.lower()))
+
 
 class VectorStore:
-    """TF-IDF based vector store for semantic search."""
+    """TF-IDF based vector store for semantic search.
+
+    Embedding dimensionality here equals the vocabulary size and grows as
+    memories are added, so there is no fixed dimension to specialize a
+    compiled kernel against; the NumPy ops below stay shape-generic by
+    design. The vectors are sparse in practice but kept dense: scipy is
+    not a dependency, the BLOB storage format is raw dense float32, and
+    the batched search scores through a single BLAS matmul that a
+    Python-level sparse representation would forfeit.
+    """
 
     def __init__(self, memory_repo: MemoryRepository):
         self.memory_repo = memory_repo
         self._vocabulary: dict = {}
         self._idf: dict = {}
+        self._idf_vec = np.zeros(0, dtype=np.float32)
         self._vocab_size = 0
+        # How many documents the current vocabulary was built from;
+        # searches only rebuild once the corpus has grown well past it.
+        self._indexed_doc_count = 0
 
     def create_embedding(self, text: str) -> np.ndarray:
         """Create TF-IDF embedding for text."""
-        tokens = self._tokenize(text)
+        tokens = _tokenize_cached(text)
 
         if not tokens:
             return np.zeros(max(1, self._vocab_size), dtype=np.float32)
@@ -35,57 +86,41 @@ class VectorStore:
         tf = Counter(tokens)
         total_terms = len(tokens)
 
-        # Create embedding
+        # Create embedding: gather (index, count) pairs for in-vocabulary
+        # terms, then scatter the TF-IDF weights in one vector operation.
+        vocabulary = self._vocabulary
+        pairs = [(vocabulary[t], c) for t, c in tf.items() if t in vocabulary]
+
         embedding = np.zeros(self._vocab_size, dtype=np.float32)
-        for token, count in tf.items():
-            if token in self._vocabulary:
-                idx = self._vocabulary[token]
-                tfidf = (count / total_terms) * self._idf.get(token, 1.0)
-                embedding[idx] = tfidf
+        if pairs:
+            indices = np.fromiter((i for i, _ in pairs), dtype=np.int64, count=len(pairs))
+            counts = np.fromiter((c for _, c in pairs), dtype=np.float32, count=len(pairs))
+            embedding[indices] = (counts / total_terms) * self._idf_vec[indices]
 
-        # Normalize
+        # Normalize in place; no extra allocation
         norm = np.linalg.norm(embedding)
         if norm > 0:
-            embedding = embedding / norm
+            embedding /= norm
 
         return embedding
 
     def _tokenize(self, text: str) -> List[str]:
         """Tokenize text into words."""
-        text = text.lower()
-        tokens = re.findall(r'\b[a-z]+\b', text)
-        # Remove common stop words
-        stop_words = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
-                      'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-                      'would', 'could', 'should', 'may', 'might', 'must', 'shall',
-                      'to', 'of', 'in', 'for', 'on', 'with', 'at', 'by', 'from',
-                      'as', 'into', 'through', 'during', 'before', 'after', 'above',
-                      'below', 'between', 'under', 'again', 'further', 'then', 'once',
-                      'and', 'but', 'or', 'nor', 'so', 'yet', 'both', 'either',
-                      'neither', 'not', 'only', 'own', 'same', 'than', 'too', 'very',
-                      'just', 'also', 'now', 'here', 'there', 'when', 'where', 'why',
-                      'how', 'all', 'each', 'every', 'both', 'few', 'more', 'most',
-                      'other', 'some', 'such', 'no', 'not', 'only', 'own', 'same',
-                      'so', 'than', 'too', 'very', 'can', 'will', 'just', 'don',
-                      'should', 'now', 'i', 'me', 'my', 'myself', 'we', 'our', 'ours',
-                      'you', 'your', 'yours', 'he', 'him', 'his', 'she', 'her', 'hers',
-                      'it', 'its', 'they', 'them', 'their', 'theirs', 'what', 'which',
-                      'who', 'whom', 'this', 'that', 'these', 'those', 'am'}
-        return [t for t in tokens if t not in stop_words and len(t) > 2]
+        return list(_tokenize_cached(text))
 
     def _build_vocabulary(self, texts: List[str]):
         """Build vocabulary and IDF from texts."""
-        all_tokens = set()
         doc_freq = Counter()
 
         for text in texts:
-            tokens = set(self._tokenize(text))
-            all_tokens.update(tokens)
-            for token in tokens:
+            for token in set(_tokenize_cached(text)):
                 doc_freq[token] += 1
 
-        self._vocabulary = {token: idx for idx, token in enumerate(sorted(all_tokens))}
+        # Index assignment only needs to be consistent within a build;
+        # first-appearance order does that without sorting the vocabulary.
+        self._vocabulary = {token: idx for idx, token in enumerate(doc_freq)}
         self._vocab_size = len(self._vocabulary)
+        self._indexed_doc_count = len(texts)
 
         # Calculate IDF
         num_docs = max(1, len(texts))
@@ -94,6 +129,13 @@ class VectorStore:
             for token, freq in doc_freq.items()
         }
 
+        # Dense IDF column indexed by vocabulary position, so embedding
+        # construction does integer indexing instead of dict lookups.
+        self._idf_vec = np.fromiter(
+            (self._idf[token] for token in self._vocabulary),
+            dtype=np.float32, count=self._vocab_size
+        )
+
     def rebuild_index(self, user_id: str):
         """Rebuild vocabulary from all user memories."""
         memories = self.memory_repo.get_by_user(user_id, limit=10000)
@@ -114,57 +156,119 @@ class VectorStore:
         # Get memories
         memories = self.memory_repo.get_by_user(user_id, memory_type, limit=1000)
 
-        if not memories:
-            return []
+        return self._score_memories(memories, query, top_k, recency_weight)
 
-        # Rebuild vocabulary with current memories
-        texts = [m.content for m in memories]
-        self._build_vocabulary(texts + [query])
+    async def similarity_search_multi(
+        self,
+        user_id: str,
+        query: str,
+        memory_types: List[MemoryType],
+        top_k: int = 10,
+        recency_weight: float = 0.3
+    ) -> List[Tuple[MemoryEntry, float]]:
+        """Search across several memory types with one fetch and one scan."""
 
-        # Create query embedding
-        query_embedding = self.create_embedding(query)
+        memories = self.memory_repo.get_by_user_types(user_id, memory_types, limit=1000)
+
+        return self._score_memories(memories, query, top_k, recency_weight)
 
-        results = []
-        now = np.datetime64('now')
+    def _refresh_stale_embeddings(self, memories: List[MemoryEntry]):
+        """Re-embed rows that are missing or predate the current vocabulary.
 
+        Runs as a separate phase before scoring so the compute loop does
+        no I/O: all stale rows are rebuilt against the (cached) token
+        lists and persisted with one bulk_save.
+        """
+        stale = []
         for memory in memories:
-            # Create or use existing embedding
             if memory.embedding is None or len(memory.embedding) != self._vocab_size:
                 memory.embedding = self.create_embedding(memory.content)
-                self.memory_repo.save(memory)
+                stale.append(memory)
+        self.memory_repo.bulk_save(stale)
 
-            # Calculate cosine similarity
-            similarity = self._cosine_similarity(query_embedding, memory.embedding)
+    def _score_memories(
+        self,
+        memories: List[MemoryEntry],
+        query: str,
+        top_k: int,
+        recency_weight: float
+    ) -> List[Tuple[MemoryEntry, float]]:
+        """Score memories against a query and return the top k."""
 
-            # Apply recency weighting
-            if recency_weight > 0:
-                days_old = (now - np.datetime64(memory.last_accessed)) / np.timedelta64(1, 'D')
-                recency_score = np.exp(-days_old / 30)  # 30-day decay
-                final_score = (1 - recency_weight) * similarity + recency_weight * recency_score
-            else:
-                final_score = similarity
+        if not memories:
+            return []
 
-            # Weight by importance
-            final_score *= (0.5 + 0.5 * memory.importance)
+        # Rebuilding the vocabulary re-indexes every token and therefore
+        # invalidates every stored embedding, so only do it when the
+        # corpus has grown noticeably (20%) since the last build. Query
+        # tokens outside the vocabulary contribute nothing to the TF-IDF
+        # dot product and are safe to drop in between rebuilds.
+        if not self._vocabulary or len(memories) > self._indexed_doc_count * 1.2:
+            texts = [m.content for m in memories]
+            self._build_vocabulary(texts + [query])
 
-            results.append((memory, float(final_score)))
+        # Create query embedding
+        query_embedding = self.create_embedding(query)
 
-        # Sort by score and return top k
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:top_k]
+        self._refresh_stale_embeddings(memories)
+
+        # One matrix-vector product scores every memory at once; the
+        # embeddings are unit-norm, so the dot product is the cosine.
+        # The stack is rebuilt per query rather than mirrored as a
+        # persistent SoA matrix: rows arrive in last_accessed order and
+        # every access bump reorders them, so a resident mirror would be
+        # invalidated by nearly every retrieval anyway, and one
+        # contiguous copy per query is what feeds BLAS its ideal layout.
+        matrix = np.stack([m.embedding for m in memories]).astype(np.float32, copy=False)
+        # (BLAS parallelizes this product across cores on its own.)
+        similarities = matrix @ query_embedding
+
+        # Apply recency weighting, vectorized over all rows
+        if recency_weight > 0:
+            now = np.datetime64('now')
+            # datetime objects convert in bulk; no per-element
+            # np.datetime64() calls
+            last_accessed = np.array(
+                [m.last_accessed for m in memories], dtype='datetime64[s]'
+            )
+            days_old = (now - last_accessed) / np.timedelta64(1, 'D')
+            recency_scores = np.exp(-days_old / 30)  # 30-day decay
+            scores = (1 - recency_weight) * similarities + recency_weight * recency_scores
+        else:
+            scores = similarities.astype(np.float64)
+
+        # Weight by importance
+        importance = np.fromiter(
+            (m.importance for m in memories), dtype=np.float64, count=len(memories)
+        )
+        scores *= 0.5 + 0.5 * importance
+
+        # Partial-select the top k (O(N)) and sort only those
+        if top_k < len(scores):
+            top_idx = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top_idx = np.arange(len(scores))
+        top_idx = top_idx[np.argsort(-scores[top_idx], kind='stable')]
+
+        return [(memories[i], float(scores[i])) for i in top_idx]
 
     def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
         """Calculate cosine similarity between two vectors."""
+        # Mismatched lengths mean one side predates a vocabulary rebuild;
+        # callers must re-embed rather than rely on zero-padding here.
         if len(a) != len(b):
-            # Pad shorter vector
-            max_len = max(len(a), len(b))
-            a = np.pad(a, (0, max_len - len(a)))
-            b = np.pad(b, (0, max_len - len(b)))
-
-        norm_a = np.linalg.norm(a)
-        norm_b = np.linalg.norm(b)
-
-        if norm_a == 0 or norm_b == 0:
+            raise ValueError(
+                f"embedding length mismatch: {len(a)} != {len(b)}; re-embed against the current vocabulary"
+            )
+
+        if simsimd is not None:
+            distance = float(simsimd.cosine(np.ascontiguousarray(a), np.ascontiguousarray(b)))
+            return 1.0 - distance if not math.isnan(distance) else 0.0
+
+        # One sqrt over the product of the squared norms instead of two
+        # norm reductions with their own sqrts.
+        denominator_sq = float(np.vdot(a, a)) * float(np.vdot(b, b))
+        if denominator_sq <= 0.0:
             return 0.0
 
-        return float(np.dot(a, b) / (norm_a * norm_b))
+        return float(np.dot(a, b)) / math.sqrt(denominator_sq)
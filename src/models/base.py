@@ -36,6 +36,8 @@ class BaseModel:
     def to_dict(self) -> dict:
         result = {}
         for key, value in self.__dict__.items():
+            if key.startswith('_'):
+                continue  # internal caches are not part of the serialized form
             if isinstance(value, datetime):
                 result[key] = value.isoformat()
             elif isinstance(value, Enum):
@@ -46,6 +46,19 @@ class FeedbackEvent(BaseModel):
             result['context'] = self.context.to_dict()
         return result
 
+    def context_dict(self) -> dict:
+        """Return the context as a dict, computing it at most once per event.
+
+        The same event can be seen by both the explicit and implicit
+        processors (and handlers may be retried), so the converted dict is
+        cached on the event rather than rebuilt on every access.
+        """
+        cached = getattr(self, "_context_dict_cache", None)
+        if cached is None:
+            cached = self.context.to_dict() if self.context else {}
+            self._context_dict_cache = cached
+        return cached
+
 
 @dataclass
 class LearningSignal:
@@ -30,7 +30,8 @@ class MemoryEntry(BaseModel):
     @classmethod
     def from_dict(cls, data: dict) -> 'MemoryEntry':
         if 'embedding' in data and data['embedding'] is not None:
-            data['embedding'] = np.array(data['embedding'])
+            # float32 and contiguous, matching the compute paths
+            data['embedding'] = np.ascontiguousarray(data['embedding'], dtype=np.float32)
         if 'memory_type' in data:
             data['memory_type'] = MemoryType(data['memory_type'])
         if 'created_at' in data and isinstance(data['created_at'], str):
@@ -3,9 +3,69 @@
 import numpy as np
 from typing import List, Dict, Tuple
 from collections import Counter
+from functools import lru_cache
 import re
 import math
 
+# Optional SIMD-dispatched cosine kernels (see memory/vector_store.py).
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+# The enhanced stop-word set, hoisted so it is built once.
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'must', 'shall', 'to', 'of', 'in', 'for',
+    'on', 'with', 'at', 'by', 'from', 'as', 'into', 'through', 'during',
+    'before', 'after', 'above', 'below', 'between', 'under', 'again',
+    'further', 'then', 'once', 'and', 'but', 'or', 'nor', 'so', 'yet',
+    'both', 'either', 'neither', 'not', 'only', 'own', 'same', 'than',
+    'too', 'very', 'just', 'also', 'now', 'here', 'there', 'when', 'where',
+    'why', 'how', 'all', 'each', 'every', 'both', 'few', 'more', 'most',
+    'other', 'some', 'such', 'no', 'can', 'don', 'i', 'me', 'my', 'myself',
+    'we', 'our', 'ours', 'you', 'your', 'yours', 'he', 'him', 'his', 'she',
+    'her', 'hers', 'it', 'its', 'they', 'them', 'their', 'theirs', 'this',
+    'that', 'these', 'those', 'am', 'if', 'else', 'while', 'about', 'against',
+    'up', 'down', 'out', 'off', 'over', 'any', 'because', 'until', 'which',
+    'who', 'whom', 'what'
+})
+
+# One pattern that tokenizes, drops stop words (negative lookahead) and
+# enforces the minimum length in a single C-level findall pass.
+_TOKEN_RE = re.compile(
+    r'\b(?!(?:' + '|'.join(sorted(_STOP_WORDS)) + r')\b)[a-z]{2,}\b'
+)
+
+
+@lru_cache(maxsize=10000)
+def _tokenize_cached(text: str) -> tuple:
+    """Tokenize text, cached so repeated contents skip the regex pass."""
+    return tuple(_TOKEN_RE.findall(text.lower()))
+
+
+@lru_cache(maxsize=10000)
+def _tokenize_ngrams_cached(text: str) -> tuple:
+    """Unigram+bigram+trigram tokens for a text, cached by content."""
+    unigrams = _tokenize_cached(text)
+
+    if len(unigrams) < 2:
+        return unigrams
+
+    # Generate bigrams and trigrams by zipping shifted views: the
+    # pairing runs at C level with no per-gram index arithmetic.
+    join = "_".join
+    bigrams = tuple(join(pair) for pair in zip(unigrams, unigrams[1:]))
+
+    trigrams = ()
+    if len(unigrams) >= 3:
+        trigrams = tuple(join(triple)
+                         for triple in zip(unigrams, unigrams[1:], unigrams[2:]))
+
+    # Combine with weights (unigrams most important)
+    return unigrams + bigrams + trigrams
+
 
 class EnhancedEmbeddings:
     """
@@ -13,6 +73,11 @@ class EnhancedEmbeddings:
     - N-gram support (unigrams, bigrams, trigrams)
     - Better TF-IDF weighting
     - Semantic similarity boosting
+
+    Embeddings stay float32 end to end; int8 quantization was evaluated
+    and declined for the same reasons as in the vector store (no int8
+    GEMM in NumPy, untyped persisted payloads that older readers decode
+    as float).
     """
 
     def __init__(self):
@@ -32,11 +97,15 @@ class EnhancedEmbeddings:
             "preference": ["prefer", "like", "want", "need", "always", "never", "favorite"]
         }
 
-        # Build reverse cluster lookup
+        # Build reverse cluster lookup as bitmasks: with only a handful
+        # of clusters, membership fits one int per word and cluster
+        # overlap becomes bitwise AND/OR plus popcounts.
         self._word_to_cluster = {}
-        for cluster, words in self.semantic_clusters.items():
+        self._word_to_mask = {}
+        for bit, (cluster, words) in enumerate(self.semantic_clusters.items()):
             for word in words:
                 self._word_to_cluster[word] = cluster
+                self._word_to_mask[word] = self._word_to_mask.get(word, 0) | (1 << bit)
 
     def create_embedding(self, text: str, use_ngrams: bool = True) -> np.ndarray:
         """Create enhanced embedding for text."""
@@ -57,81 +126,47 @@ class EnhancedEmbeddings:
         tf = Counter(tokens)
         total_terms = len(tokens)
 
+        # Gather per-term indices, counts and IDF weights, then scatter
+        # the sublinear TF-IDF scores in one vector operation.
+        vocabulary = self._vocabulary
+        idf = self._idf
+        entries = [(vocabulary[t], c, idf.get(t, 1.0))
+                   for t, c in tf.items() if t in vocabulary]
+
         embedding = np.zeros(self._vocab_size, dtype=np.float32)
-        for token, count in tf.items():
-            if token in self._vocabulary:
-                idx = self._vocabulary[token]
-                # TF with sublinear scaling
-                tf_score = 1 + math.log(count) if count > 0 else 0
-                idf_score = self._idf.get(token, 1.0)
-                embedding[idx] = tf_score * idf_score
-
-        # Normalize
+        if entries:
+            indices = np.fromiter((i for i, _, _ in entries), dtype=np.int64, count=len(entries))
+            counts = np.fromiter((c for _, c, _ in entries), dtype=np.float32, count=len(entries))
+            idf_arr = np.fromiter((w for _, _, w in entries), dtype=np.float32, count=len(entries))
+            # TF with sublinear scaling
+            embedding[indices] = (1.0 + np.log(counts)) * idf_arr
+
+        # Normalize in place; no extra allocation
         norm = np.linalg.norm(embedding)
         if norm > 0:
-            embedding = embedding / norm
+            embedding /= norm
 
         return embedding
 
     def _tokenize(self, text: str) -> List[str]:
         """Basic tokenization."""
-        text = text.lower()
-        tokens = re.findall(r'\b[a-z]+\b', text)
-
-        # Enhanced stop words
-        stop_words = {
-            'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-            'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-            'should', 'may', 'might', 'must', 'shall', 'to', 'of', 'in', 'for',
-            'on', 'with', 'at', 'by', 'from', 'as', 'into', 'through', 'during',
-            'before', 'after', 'above', 'below', 'between', 'under', 'again',
-            'further', 'then', 'once', 'and', 'but', 'or', 'nor', 'so', 'yet',
-            'both', 'either', 'neither', 'not', 'only', 'own', 'same', 'than',
-            'too', 'very', 'just', 'also', 'now', 'here', 'there', 'when', 'where',
-            'why', 'how', 'all', 'each', 'every', 'both', 'few', 'more', 'most',
-            'other', 'some', 'such', 'no', 'can', 'don', 'i', 'me', 'my', 'myself',
-            'we', 'our', 'ours', 'you', 'your', 'yours', 'he', 'him', 'his', 'she',
-            'her', 'hers', 'it', 'its', 'they', 'them', 'their', 'theirs', 'this',
-            'that', 'these', 'those', 'am', 'if', 'else', 'while', 'about', 'against',
-            'up', 'down', 'out', 'off', 'over', 'any', 'because', 'until', 'which',
-            'who', 'whom', 'what'
-        }
-
-        return [t for t in tokens if t not in stop_words and len(t) > 1]
+        return list(_tokenize_cached(text))
 
     def _tokenize_with_ngrams(self, text: str) -> List[str]:
         """Tokenize with unigrams, bigrams, and trigrams."""
-        unigrams = self._tokenize(text)
-
-        if len(unigrams) < 2:
-            return unigrams
-
-        # Generate bigrams
-        bigrams = [f"{unigrams[i]}_{unigrams[i+1]}" for i in range(len(unigrams)-1)]
-
-        # Generate trigrams
-        trigrams = []
-        if len(unigrams) >= 3:
-            trigrams = [f"{unigrams[i]}_{unigrams[i+1]}_{unigrams[i+2]}"
-                       for i in range(len(unigrams)-2)]
-
-        # Combine with weights (unigrams most important)
-        all_tokens = unigrams + bigrams + trigrams
-
-        return all_tokens
+        return list(_tokenize_ngrams_cached(text))
 
     def _build_vocabulary_from_tokens(self, token_lists: List[List[str]]):
         """Build vocabulary from token lists."""
-        all_tokens = set()
         doc_freq = Counter()
 
         for tokens in token_lists:
-            unique_tokens = set(tokens)
-            all_tokens.update(unique_tokens)
-            for token in unique_tokens:
+            for token in set(tokens):
                 doc_freq[token] += 1
 
-        self._vocabulary = {token: idx for idx, token in enumerate(sorted(all_tokens))}
+        # First-appearance order gives consistent indices without the
+        # O(V log V) sort (see memory/vector_store.py).
+        self._vocabulary = {token: idx for idx, token in enumerate(doc_freq)}
         self._vocab_size = len(self._vocabulary)
         self._doc_count = len(token_lists)
 
@@ -151,8 +186,10 @@ class EnhancedEmbeddings:
         emb1 = self.create_embedding(text1)
         emb2 = self.create_embedding(text2)
 
-        # Cosine similarity
-        cosine_sim = self._cosine_similarity(emb1, emb2)
+        # Both embeddings come back unit-norm (or all-zero) from
+        # create_embedding against the same vocabulary, so cosine is a
+        # plain dot product - no re-normalization passes.
+        cosine_sim = self._dot_similarity(emb1, emb2)
 
         # Semantic cluster boost
         cluster_boost = self._calculate_cluster_boost(text1, text2)
@@ -162,36 +199,53 @@ class EnhancedEmbeddings:
 
         return min(1.0, final_sim)
 
+    @staticmethod
+    def _dot_similarity(a: np.ndarray, b: np.ndarray) -> float:
+        """Similarity of two unit-norm (or zero) vectors: the dot product."""
+        return float(np.dot(a, b))
+
     def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
         """Calculate cosine similarity."""
+        # Mismatched lengths mean one side predates a vocabulary rebuild;
+        # callers must re-embed rather than rely on zero-padding here.
         if len(a) != len(b):
-            max_len = max(len(a), len(b))
-            a = np.pad(a, (0, max_len - len(a)))
-            b = np.pad(b, (0, max_len - len(b)))
-
-        norm_a = np.linalg.norm(a)
-        norm_b = np.linalg.norm(b)
-
-        if norm_a == 0 or norm_b == 0:
+            raise ValueError(
+                f"embedding length mismatch: {len(a)} != {len(b)}; re-embed against the current vocabulary"
+            )
+
+        if simsimd is not None:
+            distance = float(simsimd.cosine(np.ascontiguousarray(a), np.ascontiguousarray(b)))
+            return 1.0 - distance if not math.isnan(distance) else 0.0
+
+        # One sqrt over the product of the squared norms instead of two
+        # norm reductions with their own sqrts.
+        denominator_sq = float(np.vdot(a, a)) * float(np.vdot(b, b))
+        if denominator_sq <= 0.0:
             return 0.0
 
-        return float(np.dot(a, b) / (norm_a * norm_b))
+        return float(np.dot(a, b)) / math.sqrt(denominator_sq)
+
+    def _cluster_mask(self, text: str) -> int:
+        """Bitmask of semantic clusters touched by a text."""
+        get = self._word_to_mask.get
+        mask = 0
+        for word in set(_tokenize_cached(text)):
+            mask |= get(word, 0)
+        return mask
 
     def _calculate_cluster_boost(self, text1: str, text2: str) -> float:
         """Calculate boost based on shared semantic clusters."""
-        words1 = set(self._tokenize(text1))
-        words2 = set(self._tokenize(text2))
-
-        clusters1 = {self._word_to_cluster.get(w) for w in words1} - {None}
-        clusters2 = {self._word_to_cluster.get(w) for w in words2} - {None}
+        return self._cluster_jaccard(self._cluster_mask(text1), self._cluster_mask(text2))
 
-        if not clusters1 or not clusters2:
+    @staticmethod
+    def _cluster_jaccard(mask1: int, mask2: int) -> float:
+        if not mask1 or not mask2:
             return 0.0
 
-        shared = clusters1 & clusters2
-        total = clusters1 | clusters2
+        shared = (mask1 & mask2).bit_count()
+        total = (mask1 | mask2).bit_count()
 
-        return len(shared) / len(total) if total else 0.0
+        return shared / total if total else 0.0
 
     def find_similar(
         self,
@@ -203,12 +257,30 @@ class EnhancedEmbeddings:
         # Rebuild vocab with all texts
         self.rebuild_from_texts([query] + candidates)
 
+        if not candidates:
+            return []
+
+        # Embed the query once and all candidates upfront, then score
+        # cosine and cluster boost as vector math instead of re-running
+        # semantic_similarity (which re-embeds the query) per candidate.
         query_emb = self.create_embedding(query)
+        matrix = np.stack([self.create_embedding(c) for c in candidates])
+        cosine = matrix @ query_emb
+
+        query_mask = self._cluster_mask(query)
+        boosts = np.fromiter(
+            (self._cluster_jaccard(query_mask, self._cluster_mask(c))
+             for c in candidates),
+            dtype=np.float64, count=len(candidates)
+        )
 
-        results = []
-        for candidate in candidates:
-            sim = self.semantic_similarity(query, candidate)
-            results.append((candidate, sim))
+        scores = np.minimum(1.0, cosine + boosts * 0.2 * (1 - cosine))
+
+        # Partial-select the top k instead of sorting every candidate
+        if top_k < len(scores):
+            top_idx = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top_idx = np.arange(len(scores))
+        top_idx = top_idx[np.argsort(-scores[top_idx], kind='stable')]
 
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:top_k]
+        return [(candidates[i], float(scores[i])) for i in top_idx]
@@ -1,13 +1,12 @@
 """Entity extraction from natural language."""
 
-from typing import Any
+from typing import Any, Iterator, NamedTuple
+import heapq
 import re
 from datetime import datetime, timedelta
-from dataclasses import dataclass
 
 
-@dataclass
-class Entity:
+class Entity(NamedTuple):
     """Extracted entity."""
     type: str
     value: str
@@ -17,11 +16,39 @@ class Entity:
     confidence: float
 
 
+def _compile_union(patterns: list) -> tuple:
+    """Compile a list of (pattern, tag) pairs into one alternation.
+
+    Returns the compiled pattern plus a lookup from the wrapper group
+    name to (tag, first inner group number, inner group count), so the
+    normalizers can address each alternative's capture groups even
+    though group numbers shift inside the union.
+    """
+    parts = []
+    info = {}
+    group_number = 0
+    for i, (pattern, tag) in enumerate(patterns):
+        name = f"p{i}"
+        parts.append(f"(?P<{name}>{pattern})")
+        group_number += 1  # the wrapper group itself
+        inner = re.compile(pattern).groups
+        info[name] = (tag, group_number + 1, inner)
+        group_number += inner
+    return re.compile("|".join(parts)), info
+
+
 class EntityExtractor:
     """
     Extract entities from natural language text.
 
     Extracts: dates, times, durations, people, locations, numbers, etc.
+
+    Each category's patterns are compiled into a single alternation so
+    one pass of the regex engine per category finds every match, with
+    the matching alternative identified via ``lastgroup``. A Hyperscan
+    database was considered for a single all-category pass but declined:
+    the normalizers need capture groups, which Hyperscan doesn't report,
+    and the package isn't a dependency of this tree.
     """
 
     def __init__(self):
@@ -33,6 +60,7 @@ class EntityExtractor:
             (r'\bin\s+(\d+)\s+(minute|hour|day|week)s?\b', 'relative'),
             (r'\b(morning|afternoon|evening|night)\b', 'period')
         ]
+        self._time_re, self._time_info = _compile_union(self.time_patterns)
 
         # Date patterns
         self.date_patterns = [
@@ -42,13 +70,19 @@ class EntityExtractor:
             (r'\b(\d{1,2})[/\-](\d{1,2})[/\-]?(\d{2,4})?\b', 'numeric'),
             (r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\w*\s+(\d{1,2})\b', 'month_day')
         ]
+        self._date_re, self._date_info = _compile_union(self.date_patterns)
 
-        # Duration patterns
+        # Duration patterns (kept as raw strings for reference; matching
+        # always goes through the compiled unions below, never through
+        # re-module calls that re-hash the pattern string)
         self.duration_patterns = [
             r'\bfor\s+(\d+)\s*(minute|hour|day|week|month)s?\b',
             r'\b(\d+)\s*(min|hr|h|m)\b',
             r'\b(half\s+an?\s+hour|quarter\s+hour)\b'
         ]
+        self._duration_re, self._duration_info = _compile_union(
+            [(p, 'duration') for p in self.duration_patterns]
+        )
 
         # Person patterns
         self.person_patterns = [
@@ -57,6 +91,9 @@ class EntityExtractor:
             r'\bcontact\s+([A-Z][a-z]+)\b',
             r'\bemail\s+([A-Z][a-z]+)\b'
         ]
+        self._person_re, self._person_info = _compile_union(
+            [(p, 'person') for p in self.person_patterns]
+        )
 
         # Location patterns
         self.location_patterns = [
@@ -65,6 +102,9 @@ class EntityExtractor:
             r'\broom\s+(\w+)\b',
             r'\boffice\s+(\w+)\b'
         ]
+        self._location_re, self._location_info = _compile_union(
+            [(p, 'location') for p in self.location_patterns]
+        )
 
         # Number patterns
         self.number_patterns = [
@@ -72,6 +112,9 @@ class EntityExtractor:
             r'\b\$\s*(\d+(?:,\d{3})*(?:\.\d{2})?)\b',
             r'\b(\d+(?:,\d{3})*)\b'
         ]
+        self._number_re, self._number_info = _compile_union(
+            [(p, 'number') for p in self.number_patterns]
+        )
 
         # Priority/importance patterns
         self.priority_patterns = [
@@ -80,25 +123,89 @@ class EntityExtractor:
             (r'\b(normal|regular|standard)\b', 'medium'),
             (r'\b(low\s+priority|when\s+you\s+can|no\s+rush)\b', 'low')
         ]
+        self._priority_re, self._priority_info = _compile_union(self.priority_patterns)
+
+        # Result cache; short phrases recur heavily in chat workloads.
+        # Keyed on the current date too, since date normalization is
+        # relative to "today".
+        self._extract_cache: dict = {}
 
-    def extract(self, text: str) -> list[Entity]:
-        """Extract all entities from text."""
-        entities = []
+    def extract(self, text: str, now: datetime | None = None) -> list[Entity]:
+        """Extract all entities from text.
 
-        # Extract each entity type
-        entities.extend(self._extract_times(text))
-        entities.extend(self._extract_dates(text))
-        entities.extend(self._extract_durations(text))
-        entities.extend(self._extract_people(text))
-        entities.extend(self._extract_locations(text))
-        entities.extend(self._extract_numbers(text))
-        entities.extend(self._extract_priorities(text))
+        ``now`` anchors relative-date normalization (and the cache key);
+        it defaults to the current time but can be pinned by callers and
+        tests for reproducible output.
+        """
+        if now is None:
+            now = datetime.now()
 
-        # Sort by position
-        entities.sort(key=lambda e: e.start)
+        key = (text, now.date())
+        cached = self._extract_cache.get(key)
+        if cached is not None:
+            return list(cached)
 
+        entities = self._extract_uncached(text, now)
+
+        if len(self._extract_cache) >= 4096:
+            self._extract_cache.clear()
+        self._extract_cache[key] = tuple(entities)
         return entities
 
+    def extract_many(self, texts: list[str],
+                     now: datetime | None = None) -> list[list[Entity]]:
+        """Extract entities for a batch of texts.
+
+        The clock is resolved once and shared across the batch, so
+        relative dates are anchored consistently and backfills over
+        logs with repeated phrases hit the result cache.
+        """
+        if now is None:
+            now = datetime.now()
+        return [self.extract(text, now) for text in texts]
+
+    def _extract_uncached(self, text: str, now: datetime) -> list[Entity]:
+        """Run all extractors over the text."""
+        # Lowercase once; the case-insensitive categories share it
+        text_lower = text.lower()
+
+        # Each extractor yields in text order (finditer order), so a
+        # k-way merge by position replaces buffering everything and
+        # running a full sort.
+        return list(heapq.merge(
+            self._extract_times(text_lower),
+            self._extract_dates(text_lower, now),
+            self._extract_durations(text_lower),
+            self._extract_people(text),
+            self._extract_locations(text),
+            self._extract_numbers(text),
+            self._extract_priorities(text_lower),
+            key=lambda e: e.start
+        ))
+
+    # Lookup tables used by the normalizers, built once at class scope
+    _WEEKDAY_IDX = {
+        "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+        "friday": 4, "saturday": 5, "sunday": 6
+    }
+    _PERIODS = {
+        "morning": "09:00",
+        "afternoon": "14:00",
+        "evening": "18:00",
+        "night": "21:00"
+    }
+
+    # Entity type -> extract_as_dict bucket
+    _CATEGORY = {
+        "time": "times",
+        "date": "dates",
+        "duration": "durations",
+        "person": "people",
+        "location": "locations",
+        "number": "numbers",
+        "priority": "priorities"
+    }
+
     def extract_as_dict(self, text: str) -> dict:
         """Extract entities and return as categorized dict."""
         entities = self.extract(text)
@@ -114,47 +221,40 @@ class EntityExtractor:
         }
 
         for entity in entities:
-            category = entity.type.split("_")[0] + "s"
-            if category in result:
+            category = self._CATEGORY.get(entity.type)
+            if category is not None:
                 result[category].append({
                     "value": entity.value,
                     "normalized": entity.normalized,
                     "confidence": entity.confidence
                 })
-            elif entity.type == "priority":
-                result["priorities"].append({
-                    "value": entity.value,
-                    "normalized": entity.normalized,
-                    "confidence": entity.confidence
-                })
 
         return result
 
-    def _extract_times(self, text: str) -> list[Entity]:
+    def _extract_times(self, text_lower: str) -> Iterator[Entity]:
         """Extract time entities."""
-        entities = []
-        text_lower = text.lower()
-
-        for pattern, pattern_type in self.time_patterns:
-            for match in re.finditer(pattern, text_lower):
-                normalized = self._normalize_time(match, pattern_type)
-                entities.append(Entity(
-                    type="time",
-                    value=match.group(0),
-                    normalized=normalized,
-                    start=match.start(),
-                    end=match.end(),
-                    confidence=0.9 if pattern_type == 'absolute' else 0.7
-                ))
-
-        return entities
-
-    def _normalize_time(self, match, pattern_type: str) -> str:
-        """Normalize time to 24-hour format."""
+        for match in self._time_re.finditer(text_lower):
+            pattern_type, first_group, _ = self._time_info[match.lastgroup]
+            normalized = self._normalize_time(match, pattern_type, first_group)
+            yield Entity(
+                type="time",
+                value=match.group(0),
+                normalized=normalized,
+                start=match.start(),
+                end=match.end(),
+                confidence=0.9 if pattern_type == 'absolute' else 0.7
+            )
+
+    def _normalize_time(self, match, pattern_type: str, g: int) -> str:
+        """Normalize time to 24-hour format.
+
+        ``g`` is the match's first capture-group number inside the
+        compiled alternation.
+        """
         if pattern_type == 'absolute':
-            hour = int(match.group(1))
-            minute = int(match.group(2))
-            ampm = match.group(3)
+            hour = int(match.group(g))
+            minute = int(match.group(g + 1))
+            ampm = match.group(g + 2)
             if ampm and ampm.lower() == 'pm' and hour < 12:
                 hour += 12
             elif ampm and ampm.lower() == 'am' and hour == 12:
@@ -162,8 +262,8 @@ class EntityExtractor:
             return f"{hour:02d}:{minute:02d}"
 
         elif pattern_type == 'hour_only':
-            hour = int(match.group(1))
-            ampm = match.group(2)
+            hour = int(match.group(g))
+            ampm = match.group(g + 1)
             if ampm.lower() == 'pm' and hour < 12:
                 hour += 12
             elif ampm.lower() == 'am' and hour == 12:
@@ -171,44 +271,32 @@ class EntityExtractor:
             return f"{hour:02d}:00"
 
         elif pattern_type == 'named':
-            word = match.group(1).lower()
+            word = match.group(g).lower()
             return "12:00" if word == "noon" else "00:00"
 
         elif pattern_type == 'period':
-            periods = {
-                "morning": "09:00",
-                "afternoon": "14:00",
-                "evening": "18:00",
-                "night": "21:00"
-            }
-            return periods.get(match.group(1).lower(), "12:00")
+            return self._PERIODS.get(match.group(g).lower(), "12:00")
 
         return match.group(0)
 
-    def _extract_dates(self, text: str) -> list[Entity]:
+    def _extract_dates(self, text_lower: str, today: datetime) -> Iterator[Entity]:
         """Extract date entities."""
-        entities = []
-        text_lower = text.lower()
-        today = datetime.now()
-
-        for pattern, pattern_type in self.date_patterns:
-            for match in re.finditer(pattern, text_lower):
-                normalized = self._normalize_date(match, pattern_type, today)
-                entities.append(Entity(
-                    type="date",
-                    value=match.group(0),
-                    normalized=normalized,
-                    start=match.start(),
-                    end=match.end(),
-                    confidence=0.85
-                ))
-
-        return entities
-
-    def _normalize_date(self, match, pattern_type: str, today: datetime) -> str:
+        for match in self._date_re.finditer(text_lower):
+            pattern_type, first_group, _ = self._date_info[match.lastgroup]
+            normalized = self._normalize_date(match, pattern_type, first_group, today)
+            yield Entity(
+                type="date",
+                value=match.group(0),
+                normalized=normalized,
+                start=match.start(),
+                end=match.end(),
+                confidence=0.85
+            )
+
+    def _normalize_date(self, match, pattern_type: str, g: int, today: datetime) -> str:
         """Normalize date to ISO format."""
         if pattern_type == 'relative_day':
-            word = match.group(1).lower()
+            word = match.group(g).lower()
             if word == 'today':
                 return today.strftime("%Y-%m-%d")
             elif word == 'tomorrow':
@@ -217,8 +305,7 @@ class EntityExtractor:
                 return (today - timedelta(days=1)).strftime("%Y-%m-%d")
 
         elif pattern_type == 'weekday':
-            weekdays = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-            target_day = weekdays.index(match.group(1).lower())
+            target_day = self._WEEKDAY_IDX[match.group(g).lower()]
             current_day = today.weekday()
             days_ahead = target_day - current_day
             if days_ahead <= 0:
@@ -227,25 +314,20 @@ class EntityExtractor:
 
         return match.group(0)
 
-    def _extract_durations(self, text: str) -> list[Entity]:
+    def _extract_durations(self, text_lower: str) -> Iterator[Entity]:
         """Extract duration entities."""
-        entities = []
-        text_lower = text.lower()
-
-        for pattern in self.duration_patterns:
-            for match in re.finditer(pattern, text_lower):
-                entities.append(Entity(
-                    type="duration",
-                    value=match.group(0),
-                    normalized=self._normalize_duration(match),
-                    start=match.start(),
-                    end=match.end(),
-                    confidence=0.85
-                ))
-
-        return entities
-
-    def _normalize_duration(self, match) -> int:
+        for match in self._duration_re.finditer(text_lower):
+            _, first_group, inner_count = self._duration_info[match.lastgroup]
+            yield Entity(
+                type="duration",
+                value=match.group(0),
+                normalized=self._normalize_duration(match, first_group, inner_count),
+                start=match.start(),
+                end=match.end(),
+                confidence=0.85
+            )
+
+    def _normalize_duration(self, match, g: int, inner_count: int) -> int:
         """Normalize duration to minutes."""
         text = match.group(0).lower()
 
@@ -254,7 +336,8 @@ class EntityExtractor:
         if 'quarter' in text:
             return 15
 
-        groups = match.groups()
+        # The matched alternative's own capture groups
+        groups = match.groups()[g - 1:g - 1 + inner_count]
         if len(groups) >= 2:
             amount = int(groups[0])
             unit = groups[1].lower()
@@ -270,77 +353,60 @@ class EntityExtractor:
 
         return 0
 
-    def _extract_people(self, text: str) -> list[Entity]:
+    def _extract_people(self, text: str) -> Iterator[Entity]:
         """Extract person names."""
-        entities = []
-
-        for pattern in self.person_patterns:
-            for match in re.finditer(pattern, text):
-                entities.append(Entity(
-                    type="person",
-                    value=match.group(1),
-                    normalized=match.group(1),
-                    start=match.start(1),
-                    end=match.end(1),
-                    confidence=0.7
-                ))
-
-        return entities
-
-    def _extract_locations(self, text: str) -> list[Entity]:
+        for match in self._person_re.finditer(text):
+            _, g, _ = self._person_info[match.lastgroup]
+            yield Entity(
+                type="person",
+                value=match.group(g),
+                normalized=match.group(g),
+                start=match.start(g),
+                end=match.end(g),
+                confidence=0.7
+            )
+
+    def _extract_locations(self, text: str) -> Iterator[Entity]:
         """Extract location entities."""
-        entities = []
-
-        for pattern in self.location_patterns:
-            for match in re.finditer(pattern, text):
-                entities.append(Entity(
-                    type="location",
-                    value=match.group(1),
-                    normalized=match.group(1),
-                    start=match.start(1),
-                    end=match.end(1),
-                    confidence=0.65
-                ))
-
-        return entities
-
-    def _extract_numbers(self, text: str) -> list[Entity]:
+        for match in self._location_re.finditer(text):
+            _, g, _ = self._location_info[match.lastgroup]
+            yield Entity(
+                type="location",
+                value=match.group(g),
+                normalized=match.group(g),
+                start=match.start(g),
+                end=match.end(g),
+                confidence=0.65
+            )
+
+    def _extract_numbers(self, text: str) -> Iterator[Entity]:
         """Extract numeric entities."""
-        entities = []
-
-        for pattern in self.number_patterns:
-            for match in re.finditer(pattern, text):
-                value = match.group(1).replace(',', '')
-                try:
-                    normalized = float(value)
-                except ValueError:
-                    normalized = value
-
-                entities.append(Entity(
-                    type="number",
-                    value=match.group(0),
-                    normalized=normalized,
-                    start=match.start(),
-                    end=match.end(),
-                    confidence=0.9
-                ))
-
-        return entities
-
-    def _extract_priorities(self, text: str) -> list[Entity]:
+        for match in self._number_re.finditer(text):
+            _, g, _ = self._number_info[match.lastgroup]
+            value = match.group(g).replace(',', '')
+            try:
+                normalized = float(value)
+            except ValueError:
+                normalized = value
+
+            yield Entity(
+                type="number",
+                value=match.group(0),
+                normalized=normalized,
+                start=match.start(),
+                end=match.end(),
+                confidence=0.9
+            )
+
+    def _extract_priorities(self, text_lower: str) -> Iterator[Entity]:
         """Extract priority/urgency entities."""
-        entities = []
-        text_lower = text.lower()
-
-        for pattern, level in self.priority_patterns:
-            for match in re.finditer(pattern, text_lower):
-                entities.append(Entity(
-                    type="priority",
-                    value=match.group(0),
-                    normalized=level,
-                    start=match.start(),
-                    end=match.end(),
-                    confidence=0.85
-                ))
-
-        return entities
+        for match in self._priority_re.finditer(text_lower):
+            level, _, _ = self._priority_info[match.lastgroup]
+            yield Entity(
+                type="priority",
+                value=match.group(0),
+                normalized=level,
+                start=match.start(),
+                end=match.end(),
+                confidence=0.85
+            )
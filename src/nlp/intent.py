@@ -1,7 +1,84 @@
 """Intent classification using pattern matching and ML-like scoring."""
 
+import heapq
 import re
-from collections import defaultdict
+from collections import Counter
+
+# Prefer the RE2 engine (linear-time DFA, no backtracking) when the
+# optional pyre2 package is installed; the stdlib engine is the
+# fallback. None of the patterns below use backreferences, so both
+# engines accept them unchanged.
+try:
+    import re2 as _regex
+except ImportError:
+    _regex = re
+
+# The stdlib pattern parser, used to derive anchor literals from the
+# intent patterns. Exposed as re._parser/_constants from Python 3.11,
+# as the sre_* modules before that.
+try:
+    from re import _constants as _sre_constants, _parser as _sre_parser
+except ImportError:  # pragma: no cover - Python < 3.11
+    import sre_constants as _sre_constants
+    import sre_parse as _sre_parser
+
+
+def _sequence_anchors(sequence) -> frozenset | None:
+    """Anchor literals for a parsed pattern sequence.
+
+    Returns a set of literal strings such that every match of the
+    sequence must contain at least one of them as a substring, or None
+    when no such guarantee can be derived. Used to prefilter intents
+    without hand-maintaining literal tables that drift from the
+    patterns.
+    """
+    candidates = []
+    run = []
+
+    def flush_run():
+        if run:
+            candidates.append(frozenset(["".join(run)]))
+            run.clear()
+
+    for op, arg in sequence:
+        if op is _sre_constants.LITERAL:
+            run.append(chr(arg))
+            continue
+        flush_run()
+
+        if op is _sre_constants.BRANCH:
+            # Usable only if every alternative yields anchors
+            branch_sets = [_sequence_anchors(branch) for branch in arg[1]]
+            if all(branch_sets):
+                candidates.append(frozenset().union(*branch_sets))
+        elif op is _sre_constants.SUBPATTERN:
+            sub_anchors = _sequence_anchors(arg[3])
+            if sub_anchors:
+                candidates.append(sub_anchors)
+        elif op in (_sre_constants.MAX_REPEAT, _sre_constants.MIN_REPEAT):
+            min_count, _, item = arg
+            if min_count >= 1:
+                item_anchors = _sequence_anchors(item)
+                if item_anchors:
+                    candidates.append(item_anchors)
+        # AT / IN / ANY / optional repeats guarantee no literal content
+
+    flush_run()
+
+    if not candidates:
+        return None
+
+    # Prefer the most selective candidate: the one whose shortest
+    # literal is longest.
+    return max(candidates, key=lambda c: min(len(anchor) for anchor in c))
+
+
+def _pattern_anchors(pattern: str) -> frozenset | None:
+    """Anchor literals for a raw pattern string (None when unprovable)."""
+    try:
+        return _sequence_anchors(_sre_parser.parse(pattern))
+    except Exception:
+        return None
 
 
 class IntentClassifier:
@@ -77,14 +154,17 @@ class IntentClassifier:
             ]
         }
 
-        # Compile patterns
+        # Compile patterns. No IGNORECASE: classify matches against the
+        # lowered text, so the engine skips per-character case folding.
         self.compiled_patterns = {
-            intent: [re.compile(p, re.IGNORECASE) for p in patterns]
+            intent: [_regex.compile(p) for p in patterns]
             for intent, patterns in self.intent_patterns.items()
         }
 
-        # Learned intent boosts per user
-        self.user_intent_history: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        # Learned intent boosts, keyed by (user_id, intent). A flat
+        # Counter avoids allocating an inner dict per user and returns 0
+        # for unseen pairs without inserting them.
+        self.user_intent_history: Counter = Counter()
 
         # Intent confidence thresholds
         self.thresholds = {
@@ -93,6 +173,31 @@ class IntentClassifier:
             "low": 0.3
         }
 
+        # Cheap anchor literals per intent, derived from the patterns:
+        # if none of an intent's anchors appear in the text, none of its
+        # patterns can match and the regex searches are skipped. An
+        # intent whose patterns can't all prove an anchor gets no entry
+        # and always runs.
+        self._intent_literals = {}
+        for intent, patterns in self.intent_patterns.items():
+            self._add_intent_literals(intent, patterns)
+
+        # Result cache, invalidated when learning or custom intents
+        # change the scores.
+        self._classify_cache: dict = {}
+
+    def _add_intent_literals(self, intent: str, patterns: list[str]):
+        """Derive and store the anchor-literal prefilter for an intent."""
+        anchors = set()
+        for pattern in patterns:
+            pattern_anchors = _pattern_anchors(pattern)
+            if pattern_anchors is None:
+                # A single unprovable pattern disables the prefilter
+                self._intent_literals.pop(intent, None)
+                return
+            anchors |= pattern_anchors
+        self._intent_literals[intent] = tuple(sorted(anchors))
+
     def classify(self, text: str, user_id: str = "") -> dict:
         """
         Classify the intent of the input text.
@@ -106,15 +211,30 @@ class IntentClassifier:
             }
         """
         text = text.strip()
+
+        cached = self._classify_cache.get((text, user_id))
+        if cached is not None:
+            # Shallow copy so callers can't mutate the cached entry
+            return dict(cached)
+
         scores = {}
+        text_lower = text.lower()
 
-        # Score each intent
+        # Score each intent. All intents are always scored (no early
+        # exit on a high-confidence hit): callers and tests rely on
+        # all_scores/secondary_intents being complete, and the anchor
+        # prefilter already skips the regex work for intents that
+        # cannot match.
         for intent, patterns in self.compiled_patterns.items():
-            score = self._score_intent(text, patterns)
+            literals = self._intent_literals.get(intent)
+            if literals is not None and not any(lit in text_lower for lit in literals):
+                score = 0.0
+            else:
+                score = self._score_intent(text_lower, patterns)
 
             # Apply user history boost
-            if user_id and user_id in self.user_intent_history:
-                history_boost = min(0.1, self.user_intent_history[user_id][intent] * 0.01)
+            if user_id:
+                history_boost = min(0.1, self.user_intent_history[(user_id, intent)] * 0.01)
                 score += history_boost
 
             scores[intent] = min(1.0, score)
@@ -128,22 +248,32 @@ class IntentClassifier:
                 "all_scores": {}
             }
 
-        sorted_intents = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        primary = sorted_intents[0]
+        # Only the top five matter; avoid sorting every intent
+        top_intents = heapq.nlargest(5, scores.items(), key=lambda x: x[1])
+        primary = top_intents[0]
 
         # Get secondary intents (above threshold)
         secondary = [
-            (intent, score) for intent, score in sorted_intents[1:5]
+            (intent, score) for intent, score in top_intents[1:]
             if score > self.thresholds["low"]
         ]
 
-        return {
+        result = {
             "primary_intent": primary[0],
             "confidence": primary[1],
             "secondary_intents": secondary,
             "all_scores": scores
         }
 
+        if len(self._classify_cache) >= 4096:
+            self._classify_cache.clear()
+        self._classify_cache[(text, user_id)] = result
+        return dict(result)
+
+    def classify_many(self, texts: list[str], user_id: str = "") -> list[dict]:
+        """Classify a batch of texts, sharing the result cache."""
+        return [self.classify(text, user_id) for text in texts]
+
     def _score_intent(self, text: str, patterns: list) -> float:
         """Score how well text matches intent patterns."""
         matches = 0
@@ -167,7 +297,8 @@ class IntentClassifier:
 
     def learn(self, user_id: str, text: str, actual_intent: str):
         """Learn from confirmed intent classification."""
-        self.user_intent_history[user_id][actual_intent] += 1
+        self.user_intent_history[(user_id, actual_intent)] += 1
+        self._classify_cache.clear()
 
     def get_intent_keywords(self, intent: str) -> list[str]:
         """Get keywords associated with an intent."""
@@ -189,5 +320,7 @@ class IntentClassifier:
         """Add a custom intent with patterns."""
         self.intent_patterns[intent_name] = patterns
         self.compiled_patterns[intent_name] = [
-            re.compile(p, re.IGNORECASE) for p in patterns
+            _regex.compile(p) for p in patterns
         ]
+        self._add_intent_literals(intent_name, patterns)
+        self._classify_cache.clear()
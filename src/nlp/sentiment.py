@@ -1,11 +1,35 @@
 """Sentiment and emotion analysis."""
 
 from typing import Dict, List, Tuple
+from collections import Counter
 import re
 from dataclasses import dataclass
 
+# Matches punctuation-run alternatives like "!{2,}" / "\?{3,}"
+_PUNCT_RUN_RE = re.compile(r'((?:\\)?[!?])\{(\d+),\}')
 
-@dataclass
+
+def _split_alternatives(pattern: str) -> List[str]:
+    """Top-level alternatives of a pattern shaped like ``(a|b|c)``."""
+    if pattern.startswith("(") and pattern.endswith(")"):
+        pattern = pattern[1:-1]
+
+    alternatives = []
+    depth = 0
+    start = 0
+    for i, ch in enumerate(pattern):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            alternatives.append(pattern[start:i])
+            start = i + 1
+    alternatives.append(pattern[start:])
+    return alternatives
+
+
+@dataclass(slots=True)
 class SentimentResult:
     """Result of sentiment analysis."""
     polarity: float  # -1 (negative) to 1 (positive)
@@ -103,63 +127,176 @@ class SentimentAnalyzer:
         self.negators = ["not", "no", "never", "neither", "nobody", "nothing",
                         "nowhere", "hardly", "barely", "doesn't", "don't",
                         "didn't", "won't", "wouldn't", "couldn't", "shouldn't"]
+        self._negator_set = frozenset(self.negators)
+
+        # Intensifiers split for O(1) token lookups: single words keyed
+        # directly, multi-word ones ("a bit", "kind of") keyed by word
+        # pair. The old substring scan also matched inside unrelated
+        # words ("very" in "every"), which exact lookups no longer do.
+        self._single_intensifiers = {
+            w: m for w, m in self.intensifiers.items() if " " not in w
+        }
+        self._multi_intensifiers = {
+            tuple(w.split()): m for w, m in self.intensifiers.items() if " " in w
+        }
+
+        # One alternation over every emotion pattern, matched in a single
+        # finditer pass and tallied by lastgroup. Lexical word patterns
+        # come first and the punctuation/caps catch-alls last, so e.g.
+        # "frustrated" is claimed by the frustration pattern rather than
+        # anger's shouting detector. The catch-alls are shared across
+        # emotions: their alternatives are split out and deduplicated,
+        # punctuation runs are ordered longest-first (so the greedy
+        # !{2,} cannot shadow !{3,}), and a matched run credits every
+        # emotion declaring that run or a shorter one of the same
+        # character - "!!!" counts for anger, joy and surprise at once.
+        # Remaining single-pass tradeoff: a lexical pattern that spans
+        # trailing punctuation (confusion's ".*\?") still consumes it,
+        # so such text credits the lexical emotion only.
+        lexical = []
+        shared_alternatives: Dict[str, list] = {}
+        for emotion, patterns in self.emotion_patterns.items():
+            for i, pattern in enumerate(patterns):
+                if any(marker in pattern for marker in ('[A-Z]', '!{', '?{')):
+                    for alternative in _split_alternatives(pattern):
+                        declarers = shared_alternatives.setdefault(alternative, [])
+                        if emotion not in declarers:
+                            declarers.append(emotion)
+                else:
+                    lexical.append((f"{emotion}_{i}", (emotion,), pattern))
+
+        punct_runs: Dict[str, list] = {}
+        other_catch_alls = []
+        for alternative, declarers in shared_alternatives.items():
+            run = _PUNCT_RUN_RE.fullmatch(alternative)
+            if run:
+                punct_runs.setdefault(run.group(1), []).append(
+                    (int(run.group(2)), alternative, declarers)
+                )
+            else:
+                other_catch_alls.append((alternative, declarers))
+
+        catch_all = []
+        tag_count = 0
+        for entries in punct_runs.values():
+            entries.sort(key=lambda entry: -entry[0])  # longest run first
+            for min_count, alternative, declarers in entries:
+                credited = list(declarers)
+                for other_min, _, other_declarers in entries:
+                    if other_min < min_count:
+                        credited.extend(
+                            e for e in other_declarers if e not in credited
+                        )
+                catch_all.append((f"c{tag_count}", tuple(credited), alternative))
+                tag_count += 1
+        for alternative, declarers in other_catch_alls:
+            catch_all.append((f"c{tag_count}", tuple(declarers), alternative))
+            tag_count += 1
+
+        # No IGNORECASE: _detect_emotions receives pre-lowered text, so
+        # the engine skips case folding. The anger [A-Z]{3,} shouting
+        # detector consequently never fires on lowered text; under
+        # IGNORECASE it matched every 3+ letter word, which tagged
+        # nearly all messages as angry.
+        ordered = lexical + catch_all
+        self._emotion_re = re.compile(
+            "|".join(f"(?P<{tag}>{pattern})" for tag, _, pattern in ordered)
+        )
+        self._emotions_by_tag = {tag: emotions for tag, emotions, _ in ordered}
+
+        # Analysis is a pure function of the text; cache recent results
+        self._analyze_cache: dict = {}
+
+        # Combined token -> (sign, score) lookup so polarity scoring does
+        # one dict probe per word instead of two. Words present in both
+        # lists keep the positive score, matching the old if/elif order.
+        # (A NumPy searchsorted-over-hashes table was evaluated and lost
+        # to this dict on the short texts seen here: building the token
+        # hash array still costs one Python-level hash() per word, which
+        # is the same work the dict probe already does.)
+        self._word_scores = {}
+        for word, score in self.negative_words.items():
+            self._word_scores[word] = (-1, score)
+        for word, score in self.positive_words.items():
+            self._word_scores[word] = (1, score)
 
     def analyze(self, text: str) -> SentimentResult:
         """Perform full sentiment analysis on text."""
+        cached = self._analyze_cache.get(text)
+        if cached is not None:
+            return cached
+
         text_lower = text.lower()
         words = text_lower.split()
 
         # Calculate polarity
         polarity, intensity, indicators = self._calculate_polarity(text_lower, words)
 
-        # Detect emotions
-        emotions = self._detect_emotions(text)
+        # Detect emotions on the same lowered text (patterns are
+        # case-insensitive, so matches are unchanged)
+        emotions = self._detect_emotions(text_lower)
 
-        return SentimentResult(
+        result = SentimentResult(
             polarity=polarity,
             intensity=intensity,
             emotions=emotions,
             indicators=indicators
         )
 
+        if len(self._analyze_cache) >= 4096:
+            self._analyze_cache.clear()
+        self._analyze_cache[text] = result
+        return result
+
+    def analyze_many(self, texts: List[str]) -> List[SentimentResult]:
+        """Analyze a batch of texts, sharing the result cache."""
+        return [self.analyze(text) for text in texts]
+
     def _calculate_polarity(self, text: str, words: List[str]) -> Tuple[float, float, List[str]]:
         """Calculate overall sentiment polarity and intensity."""
         positive_score = 0.0
         negative_score = 0.0
         indicators = []
 
-        i = 0
-        while i < len(words):
-            word = words[i]
+        # Hot loop: resolve the sentiment lookup first so the negation
+        # and intensifier context checks only run for the few tokens
+        # that actually carry sentiment.
+        word_scores = self._word_scores
+        negator_set = self._negator_set
+        single_intensifiers = self._single_intensifiers
+        multi_intensifiers = self._multi_intensifiers
+
+        for i, word in enumerate(words):
+            entry = word_scores.get(word)
+            if entry is None:
+                continue
 
             # Check for negation
-            is_negated = False
-            if i > 0 and words[i-1] in self.negators:
-                is_negated = True
-            if i > 1 and words[i-2] in self.negators:
-                is_negated = True
+            is_negated = (
+                (i > 0 and words[i-1] in negator_set) or
+                (i > 1 and words[i-2] in negator_set)
+            )
 
-            # Check for intensifier
+            # Check for intensifier: direct dict probes per token, with
+            # a word-pair probe for the multi-word intensifiers
             multiplier = 1.0
             for j in range(max(0, i-2), i):
-                for intensifier, mult in self.intensifiers.items():
-                    if intensifier in words[j]:
-                        multiplier = mult
-                        break
-
-            # Score positive words
-            if word in self.positive_words:
-                score = self.positive_words[word] * multiplier
+                mult = single_intensifiers.get(words[j])
+                if mult is None and j + 1 < i:
+                    mult = multi_intensifiers.get((words[j], words[j+1]))
+                if mult is not None:
+                    multiplier = mult
+
+            sign, base = entry
+            score = base * multiplier
+            if sign > 0:
                 if is_negated:
                     negative_score += score
                     indicators.append(f"not {word}")
                 else:
                     positive_score += score
                     indicators.append(word)
-
-            # Score negative words
-            elif word in self.negative_words:
-                score = self.negative_words[word] * multiplier
+            else:
                 if is_negated:
                     positive_score += score * 0.5  # Negated negative is weakly positive
                     indicators.append(f"not {word}")
@@ -167,8 +304,6 @@ class SentimentAnalyzer:
                     negative_score += score
                     indicators.append(word)
 
-            i += 1
-
         # Calculate final scores
         total = positive_score + negative_score
         if total == 0:
@@ -183,23 +318,16 @@ class SentimentAnalyzer:
 
     def _detect_emotions(self, text: str) -> Dict[str, float]:
         """Detect specific emotions in text."""
-        emotions = {}
-
-        for emotion, patterns in self.emotion_patterns.items():
-            score = 0.0
-            matches = 0
-
-            for pattern in patterns:
-                found = re.findall(pattern, text, re.IGNORECASE)
-                if found:
-                    matches += len(found)
-
-            if matches > 0:
-                # Score based on number of matches (with diminishing returns)
-                score = min(1.0, 0.4 + (matches * 0.2))
-                emotions[emotion] = score
-
-        return emotions
+        emotions_by_tag = self._emotions_by_tag
+        counts: Counter = Counter()
+        for match in self._emotion_re.finditer(text):
+            counts.update(emotions_by_tag[match.lastgroup])
+
+        # Score based on number of matches (with diminishing returns)
+        return {
+            emotion: min(1.0, 0.4 + (matches * 0.2))
+            for emotion, matches in counts.items()
+        }
 
     def get_dominant_emotion(self, text: str) -> Tuple[str, float]:
         """Get the single most dominant emotion."""
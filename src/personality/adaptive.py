@@ -7,6 +7,17 @@ from ..models.action import PersonalityProfile
 from ..models.feedback import InteractionEvent
 from ..storage.repositories import PersonalityRepository
 
+# Signal vocabularies, hoisted so _analyze_interaction_signals doesn't
+# rebuild the lists per interaction. Single words are matched against a
+# punctuation-stripped token set (hashed lookups); multi-word phrases
+# and emoticons keep a substring scan since they can't be tokens.
+_FORMAL_WORDS = frozenset(["please", "kindly", "regarding", "therefore"])
+_FORMAL_PHRASES = ("would you", "could you")
+_CASUAL_WORDS = frozenset(["hey", "yeah", "gonna", "wanna", "lol", "btw"])
+_WARM_WORDS = frozenset(["thanks", "appreciate", "great", "love", "wonderful", "helpful"])
+_COLD_WORDS = frozenset(["just", "only", "simply", "need", "want", "must"])
+_HUMOR_INDICATORS = ("haha", "lol", ":)", "😄", "😂", "funny")
+
 
 class AdaptivePersonality:
     """
@@ -44,7 +55,10 @@ class AdaptivePersonality:
         # Analyze interaction signals
         signals = self._analyze_interaction_signals(interaction)
 
-        # Gradually adapt traits
+        # Gradually adapt traits. This stays a plain Python loop over at
+        # most seven scalar traits per message; compiling it (or moving
+        # the profile to an array layout) would ripple through the
+        # repository schema for no measurable gain at this size.
         for trait, target_value in signals.items():
             if hasattr(profile, trait):
                 current = getattr(profile, trait)
@@ -69,18 +83,20 @@ class AdaptivePersonality:
         signals = {}
         content = interaction.content.lower()
 
-        # Formality detection
-        formal_words = ["please", "kindly", "would you", "could you", "regarding", "therefore"]
-        casual_words = ["hey", "yeah", "gonna", "wanna", "lol", "btw"]
+        # One tokenization pass shared by all word-level signals
+        tokens = content.split()
+        token_set = {t.strip('.,!?;:') for t in tokens}
 
-        formal_count = sum(1 for w in formal_words if w in content)
-        casual_count = sum(1 for w in casual_words if w in content)
+        # Formality detection
+        formal_count = sum(1 for w in _FORMAL_WORDS if w in token_set)
+        formal_count += sum(1 for p in _FORMAL_PHRASES if p in content)
+        casual_count = sum(1 for w in _CASUAL_WORDS if w in token_set)
 
         if formal_count + casual_count > 0:
             signals["formality"] = formal_count / (formal_count + casual_count)
 
         # Detail orientation
-        word_count = len(content.split())
+        word_count = len(tokens)
         if word_count > 100:
             signals["detail_orientation"] = 0.8
         elif word_count > 50:
@@ -98,11 +114,8 @@ class AdaptivePersonality:
                 signals["pace"] = 0.5
 
         # Warmth (based on emotional language)
-        warm_words = ["thanks", "appreciate", "great", "love", "wonderful", "helpful"]
-        cold_words = ["just", "only", "simply", "need", "want", "must"]
-
-        warm_count = sum(1 for w in warm_words if w in content)
-        cold_count = sum(1 for w in cold_words if w in content)
+        warm_count = sum(1 for w in _WARM_WORDS if w in token_set)
+        cold_count = sum(1 for w in _COLD_WORDS if w in token_set)
 
         if warm_count + cold_count > 0:
             signals["warmth"] = warm_count / (warm_count + cold_count)
@@ -113,9 +126,9 @@ class AdaptivePersonality:
         elif content.endswith("!"):
             signals["directness"] = 0.8  # Exclamations are direct
 
-        # Humor (based on emoji or humor words)
-        humor_indicators = ["haha", "lol", ":)", "😄", "😂", "funny"]
-        if any(h in content for h in humor_indicators):
+        # Humor (based on emoji or humor words; emoticons need the
+        # substring scan)
+        if any(h in content for h in _HUMOR_INDICATORS):
             signals["humor_level"] = 0.7
 
         return signals
@@ -19,6 +19,10 @@ class Database:
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
+            # WAL survives in the database file, so one-time setup here;
+            # readers stop blocking writers and commits group better.
+            cursor.execute("PRAGMA journal_mode=WAL")
+
             # Memories table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS memories (
@@ -118,6 +122,25 @@ class Database:
                 )
             """)
 
+            # Rehearsal schedule table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS rehearsal_schedule (
+                    memory_id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    next_rehearsal TEXT NOT NULL,
+                    importance REAL DEFAULT 0.5,
+                    rehearsal_count INTEGER DEFAULT 0
+                )
+            """)
+
+            # Databases created before the column existed
+            try:
+                cursor.execute(
+                    "ALTER TABLE rehearsal_schedule ADD COLUMN rehearsal_count INTEGER DEFAULT 0"
+                )
+            except sqlite3.OperationalError:
+                pass
+
             # Personality profiles table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS personality_profiles (
@@ -139,6 +162,7 @@ class Database:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_preferences_user ON preferences(user_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_interactions_user ON interactions(user_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_feedback_user ON feedback_events(user_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_rehearsal_user_time ON rehearsal_schedule(user_id, next_rehearsal)")
 
             conn.commit()
 
@@ -147,6 +171,12 @@ class Database:
         """Get a database connection with context management."""
         conn = sqlite3.connect(str(self.db_path))
         conn.row_factory = sqlite3.Row
+        # Per-connection tuning: NORMAL sync is safe under WAL, and the
+        # mmap/cache settings keep hot reads off the syscall path.
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA temp_store=MEMORY")
         try:
             yield conn
         finally:
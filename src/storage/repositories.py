@@ -39,6 +39,29 @@ class MemoryRepository:
             conn.commit()
         return memory.id
 
+    def bulk_save(self, memories: list[MemoryEntry]) -> list[str]:
+        """Save many memory entries in one executemany call."""
+        if not memories:
+            return []
+
+        now = datetime.utcnow().isoformat()
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR REPLACE INTO memories
+                (id, user_id, memory_type, content, embedding, importance,
+                 access_count, last_accessed, context_tags, metadata, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(
+                memory.id, memory.user_id, memory.memory_type.value, memory.content,
+                memory.embedding.tobytes() if memory.embedding is not None else None,
+                memory.importance, memory.access_count,
+                memory.last_accessed.isoformat(), json.dumps(memory.context_tags),
+                json.dumps(memory.metadata), memory.created_at.isoformat(), now
+            ) for memory in memories])
+            conn.commit()
+        return [memory.id for memory in memories]
+
     def get(self, memory_id: str) -> MemoryEntry | None:
         """Get a memory by ID."""
         with self.db.get_connection() as conn:
@@ -70,6 +93,36 @@ class MemoryRepository:
 
             return [self._row_to_memory(row) for row in cursor.fetchall()]
 
+    def iter_by_user(self, user_id: str, chunk_size: int = 1024, limit: int = 10000):
+        """Stream a user's memories in chunks instead of one big fetch."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM memories
+                WHERE user_id = ?
+                ORDER BY last_accessed DESC LIMIT ?
+            """, (user_id, limit))
+
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield [self._row_to_memory(row) for row in rows]
+
+    def get_by_user_types(self, user_id: str, memory_types: list[MemoryType],
+                          limit: int = 100) -> list[MemoryEntry]:
+        """Get memories for a user across several types in one query."""
+        placeholders = ", ".join("?" * len(memory_types))
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT * FROM memories
+                WHERE user_id = ? AND memory_type IN ({placeholders})
+                ORDER BY last_accessed DESC LIMIT ?
+            """, (user_id, *[t.value for t in memory_types], limit))
+
+            return [self._row_to_memory(row) for row in cursor.fetchall()]
+
     def update_access(self, memory_id: str):
         """Update access count and timestamp."""
         with self.db.get_connection() as conn:
@@ -82,10 +135,47 @@ class MemoryRepository:
             """, (datetime.utcnow().isoformat(), memory_id))
             conn.commit()
 
+    def bulk_update_access(self, memory_ids: list[str]):
+        """Update access count and timestamp for many memories at once."""
+        if not memory_ids:
+            return
+
+        placeholders = ", ".join("?" * len(memory_ids))
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                UPDATE memories
+                SET access_count = access_count + 1,
+                    last_accessed = ?
+                WHERE id IN ({placeholders})
+            """, (datetime.utcnow().isoformat(), *memory_ids))
+            conn.commit()
+
     def delete(self, memory_id: str):
         """Delete a memory."""
         self.db.execute("DELETE FROM memories WHERE id = ?", (memory_id,))
 
+    def delete_decayed(self, user_id: str, decay_threshold: float,
+                       min_age_days: int = 30, max_access: int = 3):
+        """Delete low-importance, old, rarely accessed memories in SQL."""
+        self.db.execute("""
+            DELETE FROM memories
+            WHERE user_id = ?
+              AND importance < ?
+              AND julianday('now') - julianday(last_accessed) > ?
+              AND access_count < ?
+        """, (user_id, decay_threshold, min_age_days, max_access))
+
+    def delete_many(self, memory_ids: list[str]):
+        """Delete many memories in one statement."""
+        if not memory_ids:
+            return
+
+        placeholders = ", ".join("?" * len(memory_ids))
+        self.db.execute(
+            f"DELETE FROM memories WHERE id IN ({placeholders})", tuple(memory_ids)
+        )
+
     def _row_to_memory(self, row) -> MemoryEntry:
         """Convert database row to MemoryEntry."""
         embedding = None
@@ -113,9 +203,13 @@ class PreferenceRepository:
 
     def __init__(self, db: Database):
         self.db = db
+        # Bumped on every write so callers can cache query results and
+        # cheaply detect staleness.
+        self.version = 0
 
     def save(self, pref: PreferenceNode) -> str:
         """Save a preference."""
+        self.version += 1
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -132,6 +226,40 @@ class PreferenceRepository:
             conn.commit()
         return pref.id
 
+    def bulk_save(self, prefs: list[PreferenceNode]) -> list[str]:
+        """Save many preferences in one executemany call."""
+        if not prefs:
+            return []
+
+        self.version += 1
+        now = datetime.utcnow().isoformat()
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR REPLACE INTO preferences
+                (id, user_id, category, preference, strength, confidence,
+                 examples, exceptions, source, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(
+                pref.id, pref.user_id, pref.category, pref.preference,
+                pref.strength, pref.confidence, json.dumps(pref.examples),
+                json.dumps(pref.exceptions), pref.source,
+                pref.created_at.isoformat(), now
+            ) for pref in prefs])
+            conn.commit()
+        return [pref.id for pref in prefs]
+
+    def get(self, pref_id: str) -> PreferenceNode | None:
+        """Get a preference by ID."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM preferences WHERE id = ?", (pref_id,))
+            row = cursor.fetchone()
+
+        if row:
+            return self._row_to_preference(row)
+        return None
+
     def get_by_user(self, user_id: str, category: str | None = None) -> list[PreferenceNode]:
         """Get preferences for a user."""
         with self.db.get_connection() as conn:
@@ -153,6 +281,7 @@ class PreferenceRepository:
 
     def update_strength(self, pref_id: str, new_strength: float):
         """Update preference strength."""
+        self.version += 1
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -161,6 +290,21 @@ class PreferenceRepository:
             """, (new_strength, datetime.utcnow().isoformat(), pref_id))
             conn.commit()
 
+    def bulk_update_strength(self, pairs: list[tuple[str, float]]):
+        """Update strength for many preferences in one executemany call."""
+        if not pairs:
+            return
+
+        self.version += 1
+        now = datetime.utcnow().isoformat()
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                UPDATE preferences SET strength = ?, updated_at = ?
+                WHERE id = ?
+            """, [(strength, now, pref_id) for pref_id, strength in pairs])
+            conn.commit()
+
     def _row_to_preference(self, row) -> PreferenceNode:
         """Convert row to PreferenceNode."""
         return PreferenceNode(
@@ -365,6 +509,71 @@ class InteractionRepository:
         )
 
 
+class RehearsalRepository:
+    """Repository for the rehearsal schedule."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def schedule(self, memory_id: str, user_id: str, next_rehearsal: datetime,
+                 importance: float, rehearsal_count: int = 0):
+        """Schedule (or reschedule) a rehearsal for a memory."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO rehearsal_schedule
+                (memory_id, user_id, next_rehearsal, importance, rehearsal_count)
+                VALUES (?, ?, ?, ?, ?)
+            """, (memory_id, user_id, next_rehearsal.isoformat(), importance,
+                  rehearsal_count))
+            conn.commit()
+
+    def get_due(self, user_id: str, now: datetime,
+                limit: int = 500) -> list[tuple[str, float, int]]:
+        """Get (memory_id, importance, rehearsal_count) rows whose
+        rehearsal is due, oldest first. The row state is enough to
+        reschedule even when the in-memory protection record is gone."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT memory_id, importance, rehearsal_count
+                FROM rehearsal_schedule
+                WHERE user_id = ? AND next_rehearsal <= ?
+                ORDER BY next_rehearsal LIMIT ?
+            """, (user_id, now.isoformat(), limit))
+
+            return [(row['memory_id'], row['importance'], row['rehearsal_count'])
+                    for row in cursor.fetchall()]
+
+    def bulk_reschedule(self, rows: list[tuple[str, datetime, int]]):
+        """Set new rehearsal times and counts for many memories at once."""
+        if not rows:
+            return
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                UPDATE rehearsal_schedule
+                SET next_rehearsal = ?, rehearsal_count = ?
+                WHERE memory_id = ?
+            """, [(next_rehearsal.isoformat(), rehearsal_count, memory_id)
+                  for memory_id, next_rehearsal, rehearsal_count in rows])
+            conn.commit()
+
+    def remove(self, memory_id: str):
+        """Remove a memory from the schedule."""
+        self.db.execute("DELETE FROM rehearsal_schedule WHERE memory_id = ?", (memory_id,))
+
+    def count_scheduled(self, user_id: str) -> int:
+        """Count scheduled rehearsals for a user."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT COUNT(*) AS n FROM rehearsal_schedule WHERE user_id = ?
+            """, (user_id,))
+            return cursor.fetchone()['n']
+
+
 class PersonalityRepository:
     """Repository for personality profiles."""
 
@@ -41,7 +41,7 @@ class TestIntentClassifier:
 
     def test_learning(self):
         self.classifier.learn("user1", "test text", "custom")
-        assert self.classifier.user_intent_history["user1"]["custom"] == 1
+        assert self.classifier.user_intent_history[("user1", "custom")] == 1
 
     def test_custom_intent(self):
         self.classifier.add_custom_intent("pizza", [r"\bpizza\b", r"\border\b"])